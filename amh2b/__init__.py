@@ -58,9 +58,10 @@ from .eyeblink.panel import (EBLINK_SUB_FUNC_ITEMS, draw_panel_eye_blink)
 from .eyelid.func import elid_rig_type_items
 from .eyelid.operator import (AMH2B_OT_AddLidLook, AMH2B_OT_RemoveLidLook)
 from .eyelid.panel import draw_panel_eye_lid
-from .shape_key.func import SK_FUNC_ITEMS
+from .shape_key.func import (SK_BAKE_TARGET_ITEMS, SK_CACHE_LOAD_TYPE_ITEMS, SK_FUNC_ITEMS)
 from .shape_key.operator import (AMH2B_OT_BakeDeformShapeKeys, AMH2B_OT_SearchFileForAutoShapeKeys,
-    AMH2B_OT_SKFuncDelete, AMH2B_OT_CopyOtherSK, AMH2B_OT_ApplyModifierSK)
+    AMH2B_OT_SKFuncDelete, AMH2B_OT_CopyOtherSK, AMH2B_OT_ApplyModifierSK, AMH2B_OT_LoadBakeCache,
+    AMH2B_OT_ExportShapeKeyLibrary, AMH2B_OT_ImportShapeKeyLibrary, AMH2B_OT_ClearSurfaceBindCache)
 from .shape_key.panel import draw_panel_shape_key
 from .geo_nodes.operator import (AMH2B_OT_CreateGeoNodesDirectionalShrinkwrap,
     AMH2B_OT_CreateGeoNodesDirectionalThickShrinkwrap, AMH2B_OT_CreateGeoNodesShrinkwrap,
@@ -74,9 +75,11 @@ from .soft_body.operator import (AMH2B_OT_AddSoftBodyWeightTestCalc, AMH2B_OT_Fi
     AMH2B_OT_DataTransferSBWeight, AMH2B_OT_PresetSoftBody)
 from .soft_body.panel import draw_panel_soft_body
 from .template import AMH2B_OT_MakeObjectSearchable
-from .vgroup import (AMH2B_OT_CopyVertexGroupsByPrefix, AMH2B_OT_DeleteVertexGroupsByPrefix,
-    AMH2B_OT_SearchFileForAutoVGroups)
+from .vgroup import (AMH2B_OT_CleanupVertexGroupsByPrefix, AMH2B_OT_CopyVertexGroupsByPrefix,
+    AMH2B_OT_DeleteVertexGroupsByPrefix, AMH2B_OT_SearchFileForAutoVGroups)
 from .weight_paint import (AMH2B_OT_GrowPaint, AMH2B_OT_SelectVertexByWeight)
+from .weight_paint_func import (WP_FALLOFF_ITEMS, WP_GROW_PAINT_MODE_DISTANCE, WP_GROW_PAINT_MODE_ITEMS,
+    WP_SELECT_COMBINE_ITEMS)
 
 def draw_panel_vertex_group(self, context, func_grp_box):
     layout = self.layout
@@ -88,6 +91,16 @@ def draw_panel_vertex_group(self, context, func_grp_box):
     layout.prop(scn.amh2b, "vg_func_name_prefix")
     layout.prop(scn.amh2b, "vg_swap_autoname_ext")
     layout.prop(scn.amh2b, "vg_create_name_only")
+    layout.prop(scn.amh2b, "vg_weight_precision")
+    layout.separator()
+    layout.operator(AMH2B_OT_CleanupVertexGroupsByPrefix.bl_idname)
+    box = layout.box()
+    box.prop(scn.amh2b, "vg_clean")
+    row = box.row()
+    row.active = scn.amh2b.vg_clean
+    row.prop(scn.amh2b, "vg_clean_epsilon")
+    box.prop(scn.amh2b, "vg_limit_total")
+    box.prop(scn.amh2b, "vg_normalize")
 
 def draw_panel_weight_paint(self, context, func_grp_box):
     layout = self.layout
@@ -98,10 +111,20 @@ def draw_panel_weight_paint(self, context, func_grp_box):
     box.prop(scn.amh2b, "wp_select_vertex_min_w")
     box.prop(scn.amh2b, "wp_select_vertex_max_w")
     box.prop(scn.amh2b, "wp_select_vertex_deselect")
+    box.prop(scn.amh2b, "wp_select_vertex_other_groups")
+    row = box.row()
+    row.active = scn.amh2b.wp_select_vertex_other_groups != ""
+    row.prop(scn.amh2b, "wp_select_vertex_combine", expand=True)
+    box.prop(scn.amh2b, "wp_select_vertex_unassigned_zero")
     layout.label(text="Grow Selection Paint")
     layout.operator(AMH2B_OT_GrowPaint.bl_idname)
     box = layout.box()
-    box.prop(scn.amh2b, "wp_grow_paint_iterations")
+    box.prop(scn.amh2b, "wp_grow_paint_mode")
+    if scn.amh2b.wp_grow_paint_mode == WP_GROW_PAINT_MODE_DISTANCE:
+        box.prop(scn.amh2b, "wp_grow_paint_distance")
+        box.prop(scn.amh2b, "wp_grow_paint_falloff")
+    else:
+        box.prop(scn.amh2b, "wp_grow_paint_iterations")
     box.prop(scn.amh2b, "wp_grow_paint_start_weight")
     box.prop(scn.amh2b, "wp_grow_paint_end_weight")
     box.prop(scn.amh2b, "wp_paint_initial_selection")
@@ -372,6 +395,13 @@ class AMH2B_PG_ScnAMH2B(PropertyGroup):
     sk_bind_frame: IntProperty(name="Bind Frame", description="In this frame, modified (after viewport visible " \
         "modifiers are applied) mesh vertices must be in their original locations\nHint: vertex locations in " \
         "OBJECT mode must be same as in EDIT mode.", default=0, min=0)
+    sk_bind_cache: BoolProperty(name="Bind Cache", description="Re-use vertex bind map stored on object by " \
+        "previous bake, if mesh, modifiers, Bind Frame, and Mask are unchanged. Bind map is stored after each bake",
+        default=True)
+    sk_isolate: BoolProperty(name="Isolate Evaluation", description="During bake, temporarily disable in " \
+        "viewports all objects that active object does not depend on (parents, modifier objects, constraint " \
+        "targets, driver targets), so only active object and its dependencies are evaluated when frame changes. " \
+        "Objects are re-enabled after bake", default=False)
     sk_start_frame: IntProperty(name="Start Frame", description="Choose first frame of mesh animation to convert " \
         "to Shape Key", default=1, min=0)
     sk_end_frame: IntProperty(name="End Frame", description="Choose last frame of mesh animation to convert to " \
@@ -380,8 +410,52 @@ class AMH2B_PG_ScnAMH2B(PropertyGroup):
         "keyframes to ShapeKey 'Evaluation Time', from 'Start Frame' to 'End Frame'", default=True)
     sk_add_frame_to_name: BoolProperty(name="Add Frame to Name", description="Append frame number to key name " \
         "(e.g. DSKey005, DSKey006)", default=True)
+    sk_incremental: BoolProperty(name="Incremental", description="Re-bake only frames where fingerprint (matrices " \
+        "of object and objects it depends on, pose bone matrices, driven values, and modifier settings) changed " \
+        "since previous Incremental bake. Shape keys of changed frames are replaced, keeping names and " \
+        "keyframes. Requires Add Frame to Name, not used with Adaptive Frames, Compress, or Cache File. Parallel " \
+        "and Dedup are skipped when Incremental is used", default=False)
+    sk_adaptive: BoolProperty(name="Adaptive Frames", description="Bake a shape key only when deformation " \
+        "differs from linear interpolation of neighbouring baked shape keys by more than Adaptive Tolerance. " \
+        "Skipped frames are interpolated by keyframes", default=False)
+    sk_adaptive_tolerance: FloatProperty(name="Adaptive Tolerance", description="Maximum vertex distance " \
+        "allowed between deformation of a skipped frame and linear interpolation of neighbouring baked shape keys",
+        default=0.001, min=0.0, precision=4)
+    sk_dedup: BoolProperty(name="Dedup", description="Re-use shape key of a previous baked frame, by keyframes, " \
+        "if all vertexes of baked frame are within Dedup Tolerance distance of previous frame's shape key. Useful " \
+        "for cyclic animations, e.g. walk loops", default=False)
+    sk_dedup_tolerance: FloatProperty(name="Dedup Tolerance", description="Maximum vertex distance allowed " \
+        "between baked frame and re-used shape key", default=0.0001, min=0.0, precision=5)
+    sk_compress: BoolProperty(name="Compress (PCA)", description="Instead of one shape key per baked frame, " \
+        "create a small number of basis shape keys (PCA) and keyframe their weights per frame. Basis shape keys " \
+        "are always keyframed", default=False)
+    sk_compress_max_error: FloatProperty(name="Max RMS Error", description="Add basis shape keys until RMS " \
+        "vertex error, between baked frames and compressed frames, is less than or equal to this distance",
+        default=0.0005, min=0.0, precision=5)
+    sk_compress_max_keys: IntProperty(name="Max Keys", description="Maximum number of basis shape keys created " \
+        "by compression", default=32, min=1)
+    sk_bake_target: EnumProperty(name="Bake Target", description="Output of Bake Deform Keys",
+        items=SK_BAKE_TARGET_ITEMS)
+    sk_bake_cache_filepath: StringProperty(name="Cache File", description="Bake cache file path. Deform offsets " \
+        "are written to .npy file and header to .json file, with same name", default="//deform_bake.json",
+        subtype='FILE_PATH')
+    sk_cache_load_type: EnumProperty(name="Load Type", description="Type of data created by Load Cache",
+        items=SK_CACHE_LOAD_TYPE_ITEMS)
+    sk_cache_load_start: IntProperty(name="Load Start", description="First frame to load from bake cache file",
+        default=1, min=0)
+    sk_cache_load_end: IntProperty(name="Load End", description="Last frame to load from bake cache file",
+        default=2, min=0)
     sk_dynamic: BoolProperty(name="Dynamic", description="Respect armature transformations when calculating " \
         "deform shape keys. Dynamic is slower to run than not-Dynamic", default=True)
+    sk_dynamic_analytic: BoolProperty(name="Analytic Armature", description="Calculate Dynamic deform matrices " \
+        "from vertex group weights and pose bone matrices, if object has a single ARMATURE modifier using vertex " \
+        "groups (no envelopes, no preserve volume, no B-Bones) and no other non-deform modifiers. Otherwise, " \
+        "deform matrices are evaluated with temporary axis shape keys", default=True)
+    sk_parallel: BoolProperty(name="Parallel", description="Bake frames in chunks with headless Blender worker " \
+        "processes, using a saved copy of current file. Bind map is shared with workers, and baked shape keys are " \
+        "created in frame order", default=False)
+    sk_parallel_workers: IntProperty(name="Workers", description="Number of headless Blender worker processes " \
+        "used by Parallel bake. Frame range is split into this many chunks", default=4, min=1)
     sk_extra_accuracy: IntProperty(name="",
         description="Extra accuracy iterations when baking shape keys with dynamic enabled", default=0, min=0)
     sk_deform_name_prefix: StringProperty(name="Prefix",
@@ -389,6 +463,10 @@ class AMH2B_PG_ScnAMH2B(PropertyGroup):
     sk_adapt_size: BoolProperty(name="Adapt Size",
         description="Adapt size of shape key to size of mesh, per vertex, by ratio of sums of connected edge " +
         "lengths", default=True)
+    sk_surface_bind: BoolProperty(name="Surface Bind", description="Copy Keys to meshes with different " \
+        "topology (e.g. retopologized clothing), by binding each destination vertex to nearest point on active " \
+        "object's surface. Binding is cached on destination object and re-used until meshes or object transforms " \
+        "change. Adapt Size is not used with Surface Bind", default=False)
     sk_swap_autoname_ext: BoolProperty(name="Swap Autoname Ext", description="If shapekey copy function is tried " \
         "and fails, re-try swap with objects 'auto-name' extension removed.\ne.g. Object Mass0007:Eyebrow010.003 " \
         "shapekeys may be copied from object Mass0007:Eyebrow010 shapekeys", default=True)
@@ -410,6 +488,17 @@ class AMH2B_PG_ScnAMH2B(PropertyGroup):
         default=True)
     vg_create_name_only: BoolProperty(name="Create Groups Only in Name",
         description="Create vertex groups 'in name only' when copying", default=False)
+    vg_weight_precision: FloatProperty(name="Weight Precision", description="Round copied / cleanup vertex " \
+        "weights to nearest multiple of this value, so vertexes with same rounded weight are written together " \
+        "(faster). Use 0 to copy exact weights", default=0.0, min=0.0, max=1.0, precision=4)
+    vg_clean: BoolProperty(name="Clean", description="Cleanup Groups removes vertexes from vertex groups where " \
+        "weight is less than or equal to Clean Limit", default=True)
+    vg_clean_epsilon: FloatProperty(name="Clean Limit", description="Vertexes with weight less than or equal to " \
+        "this value are removed from vertex group", default=0.0, min=0.0, max=1.0, precision=4)
+    vg_limit_total: IntProperty(name="Limit Total", description="Cleanup Groups keeps only this number of largest " \
+        "weights per vertex, removing vertex from other vertex groups. Use 0 for no limit", default=4, min=0)
+    vg_normalize: BoolProperty(name="Normalize", description="Cleanup Groups scales weights of each vertex so " \
+        "that sum of weights is 1", default=True)
     viseme: PointerProperty(type=AMH2B_PG_ScnAMH2BViseme)
     wp_select_vertex_min_w: FloatProperty(name="Min Weight",
         description="Minimum weight of vertex to select", default=0.0, min=0.0, max=1.0)
@@ -417,6 +506,19 @@ class AMH2B_PG_ScnAMH2B(PropertyGroup):
         description="Maximum weight of vertex to select", default=1.0, min=0.0, max=1.0)
     wp_select_vertex_deselect: BoolProperty(name="Deselect All First",
         description="Deselect all vertexes before selecting by weight", default=True)
+    wp_select_vertex_other_groups: StringProperty(name="Other Groups", description="Weight ranges of other " \
+        "vertex groups, combined with active vertex group weight range. Format is 'group name:min:max', separated " \
+        "by commas, e.g. 'cloth_goal:0.2:0.8, mask:0:0'", default="")
+    wp_select_vertex_combine: EnumProperty(name="Combine", description="Combine weight ranges of active vertex " \
+        "group and Other Groups with And / Or", items=WP_SELECT_COMBINE_ITEMS)
+    wp_select_vertex_unassigned_zero: BoolProperty(name="Unassigned as Zero", description="Vertexes not assigned " \
+        "to a vertex group have weight 0 in that group, instead of never being selected", default=False)
+    wp_grow_paint_mode: EnumProperty(name="Mode", description="Blend weight paint by 'select more' rings, or by " \
+        "distance along mesh edges", items=WP_GROW_PAINT_MODE_ITEMS)
+    wp_grow_paint_distance: FloatProperty(name="Distance", description="Distance (along mesh edges, in world " \
+        "space) from selected vertexes where 'End Weight' is applied", default=0.1, min=0.0001, subtype='DISTANCE')
+    wp_grow_paint_falloff: EnumProperty(name="Falloff", description="Falloff curve used to blend from 'Start " \
+        "Weight' to 'End Weight' over distance", items=WP_FALLOFF_ITEMS)
     wp_grow_paint_iterations: IntProperty(name="Iterations",
         description="Number of growth iterations - 'select more' is used each iteration to select more vertexes " +
         "before applying weight paint", default=1, min=1)
@@ -439,16 +541,21 @@ classes = [
     AMH2B_PG_ScnAMH2BViseme,
     AMH2B_PG_ScnAMH2B,
     AMH2B_OT_CopyVertexGroupsByPrefix,
+    AMH2B_OT_CleanupVertexGroupsByPrefix,
     AMH2B_OT_DeleteVertexGroupsByPrefix,
     AMH2B_OT_MakeObjectSearchable,
     AMH2B_OT_SearchFileForAutoVGroups,
     AMH2B_OT_GrowPaint,
     AMH2B_OT_SelectVertexByWeight,
     AMH2B_OT_BakeDeformShapeKeys,
+    AMH2B_OT_LoadBakeCache,
+    AMH2B_OT_ExportShapeKeyLibrary,
+    AMH2B_OT_ImportShapeKeyLibrary,
     AMH2B_OT_ApplyModifierSK,
     AMH2B_OT_SearchFileForAutoShapeKeys,
     AMH2B_OT_SKFuncDelete,
     AMH2B_OT_CopyOtherSK,
+    AMH2B_OT_ClearSurfaceBindCache,
     AMH2B_OT_CreateGeoNodesShrinkwrap,
     AMH2B_OT_CreateGeoNodesThickShrinkwrap,
     AMH2B_OT_CreateGeoNodesDirectionalShrinkwrap,
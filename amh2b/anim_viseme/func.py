@@ -24,7 +24,7 @@ import bpy
 from ..bl_util import (ast_literal_eval_lines, get_file_eval_dict, get_next_name, keyframe_shapekey_value,
     get_thing_to_keyframe)
 from ..const import ADDON_BASE_FILE
-from ..lex_py_attributes import lex_py_attributes
+from ..lex_py_attributes import (DATA_PATH_KIND_BONE, parse_data_path)
 from ..armature.func import (copy_action_frame, is_bone_action)
 
 VISEME_FUNC_VISEME_SCRIPT = "VISEME_SCRIPT"
@@ -88,10 +88,9 @@ def get_ref_bone_loc_data(arm, ref_action_name):
     for ref_fc in ref_action.fcurves:
         if not ref_fc.data_path.startswith("pose.bones["):
             continue
-        fc_tokens, _ = lex_py_attributes(ref_fc.data_path)
-        if len(fc_tokens) < 3:
+        bone_name = parse_data_path(ref_fc.data_path).bone_name
+        if bone_name is None:
             continue
-        bone_name = ref_fc.data_path[ fc_tokens[2][0]+2 : fc_tokens[2][1]-2 ]
         result_data[bone_name] = None
     for bone_name in result_data.keys():
         if bone_name not in arm.bones:
@@ -217,14 +216,15 @@ def create_actions_from_frame_data(ob, frame_data, action_name_prepend, mark_ass
         current_action = bpy.data.actions.new(action_name_prepend+action_name)
         ob.animation_data.action = current_action
         for data_path, indexed_values in datapath_value_pairs:
-            fc_tokens, _ = lex_py_attributes(data_path)
+            dp_info = parse_data_path(data_path)
+            fc_tokens = dp_info.tokens
             if len(fc_tokens) < 4:
                 continue
-            bone_name = data_path[ fc_tokens[2][0]+2 : fc_tokens[2][1]-2 ]
+            bone_name = dp_info.bone_name
             if bone_name not in ob.pose.bones:
                 continue
-            prop_name = data_path[data_path.rfind(".")+1:]
-            thing_to_keyframe = get_thing_to_keyframe(ob, data_path, fc_tokens, bone_name)
+            prop_name = dp_info.prop_name
+            thing_to_keyframe = get_thing_to_keyframe(ob, dp_info)
             if thing_to_keyframe is None:
                 continue
             thing_prop_to_keyframe = getattr(thing_to_keyframe, prop_name)
@@ -246,7 +246,7 @@ def create_actions_from_frame_data(ob, frame_data, action_name_prepend, mark_ass
                     fc.color_mode = 'AUTO_RGB'
                 actual_value = value
                 # apply reference bone location scaling to location F-Curves only
-                if len(fc_tokens) == 4 and prop_name == 'location' and index in range(3):
+                if dp_info.kind == DATA_PATH_KIND_BONE and prop_name == 'location' and index in range(3):
                     actual_value *= ref_location_scale[index]
                 kp = fc.keyframe_points[0]
                 kp.co = (LOAD_FRAME_NUM, actual_value)
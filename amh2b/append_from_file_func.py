@@ -17,25 +17,56 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-import os
+import re
 
-# Returns True if material was successfully appended.
-# Checks if the material already exists in this file, if it does exist then rename the
-# current material, and then append the new material.
-def append_object_from_blend_file(mat_filepath, obj_name):
-    # path inside of file (i.e. like opening the "Append" window; see Action, Armature, Brush, Camera, ...)
-    inner_path = "Object"
+from .template import get_searchable_object_name
 
-    try:
-        bpy.ops.wm.append(
-            filepath=os.path.join(mat_filepath, inner_path, obj_name),
-            directory=os.path.join(mat_filepath, inner_path),
-            filename=obj_name
-            )
-    except:
-        return False
+# returns set of all ID data blocks in current file
+def get_all_data_ids():
+    data_ids = set()
+    for attr in dir(bpy.data):
+        data_coll = getattr(bpy.data, attr, None)
+        if isinstance(data_coll, bpy.types.bpy_prop_collection):
+            data_ids.update(data_coll)
+    return data_ids
+
+# remove ID data blocks 'appended_ids' (from append_auto_search_objects()), in one batch
+def remove_appended_data(appended_ids):
+    bpy.data.batch_remove(list(appended_ids))
 
-    if bpy.data.objects.get(obj_name) is None:
-        return False
+# returns name of Object in 'available_names' to use for Object named 'obj_name', or None if not found. Searchable
+# name (MHX prefix removed) is used, and if 'swap_autoname_ext' is True and name ends with '.001', '.002', etc.,
+# then name with '.XYZ' extension removed is tried
+def get_auto_search_object_name(available_names, obj_name, swap_autoname_ext):
+    search_name = get_searchable_object_name(obj_name)
+    if search_name in available_names:
+        return search_name
+    if swap_autoname_ext and re.match(".*\.[0-9]{3}", search_name) and search_name[:-4] in available_names:
+        return search_name[:-4]
+    return None
 
-    return True
+# open blend file once, and append (without linking to scene) only the Objects needed by 'dest_objects', matched by
+# name with get_auto_search_object_name(). Returns (src_objects, appended_ids), where 'src_objects' is dict of
+# {dest_object: appended_object}, and 'appended_ids' is set of all ID data blocks added by append, to be removed
+# with remove_appended_data(). Only these IDs are removed, so data created later (e.g. new shape key data blocks
+# of dest objects) is kept
+def append_auto_search_objects(blend_filepath, dest_objects, swap_autoname_ext):
+    data_ids_before = get_all_data_ids()
+    dest_names = {}
+    try:
+        with bpy.data.libraries.load(blend_filepath, link=False) as (data_from, data_to):
+            available_names = set(data_from.objects)
+            for dest_ob in dest_objects:
+                src_name = get_auto_search_object_name(available_names, dest_ob.name, swap_autoname_ext)
+                if src_name is not None:
+                    dest_names[dest_ob] = src_name
+            load_names = sorted(set(dest_names.values()))
+            data_to.objects = load_names
+    except OSError:
+        print("append_auto_search_objects(): Unable to open blend file: " + blend_filepath)
+        return {}, set()
+    appended_ids = get_all_data_ids() - data_ids_before
+    # appended Objects are given in same order as names, with None for Objects that could not be appended
+    loaded_objects = { name: ob for name, ob in zip(load_names, data_to.objects) if ob is not None }
+    src_objects = { dest_ob: loaded_objects[name] for dest_ob, name in dest_names.items() if name in loaded_objects }
+    return src_objects, appended_ids
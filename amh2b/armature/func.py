@@ -25,7 +25,7 @@ from mathutils import Quaternion
 
 from ..bl_util import (ast_literal_eval_textblock, get_file_eval_dict, do_tag_redraw, get_thing_to_keyframe)
 from ..const import ADDON_BASE_FILE
-from ..lex_py_attributes import lex_py_attributes
+from ..lex_py_attributes import (DATA_PATH_KIND_BONE, DATA_PATH_KIND_CONSTRAINT, parse_data_path)
 from ..object_func import (get_scene_user_collection, is_object_in_sub_collection)
 
 ARM_FUNC_RETARGET = "ARM_FUNC_RETARGET"
@@ -708,10 +708,10 @@ def select_retarget_bones(ob):
 def select_fcurve_bones(ob, action, frame_range_min, frame_range_max):
     select_bone_names = {}
     for fc in action.fcurves:
-        fc_tokens, _ = lex_py_attributes(fc.data_path)
-        if len(fc_tokens) < 4:
+        dp_info = parse_data_path(fc.data_path)
+        if len(dp_info.tokens) < 4:
             continue
-        bone_name = fc.data_path[ fc_tokens[2][0]+2 : fc_tokens[2][1]-2 ]
+        bone_name = dp_info.bone_name
         if bone_name not in ob.data.bones or select_bone_names.get(bone_name) == True:
             continue
         if frame_range_min == None and frame_range_max == None:
@@ -809,15 +809,15 @@ def copy_action_frame(ob, action_name, src_frame_num, loc_mult, rot_mult, scl_po
     for fc in apply_action.fcurves:
         if not fc.data_path.startswith("pose.bones["):
             continue
-        fc_tokens, _ = lex_py_attributes(fc.data_path)
-        if len(fc_tokens) < 4:
+        dp_info = parse_data_path(fc.data_path)
+        if len(dp_info.tokens) < 4:
             continue
-        bone_name = fc.data_path[ fc_tokens[2][0]+2 : fc_tokens[2][1]-2 ]
+        bone_name = dp_info.bone_name
         if bone_name not in pose_bones:
             continue
         if only_selected and not ob.data.bones[bone_name].select:
             continue
-        prop_name = fc.data_path[fc.data_path.rfind(".")+1:]
+        prop_name = dp_info.prop_name
         if fc.data_path not in frame_data:
             frame_data[fc.data_path] = {}
         # check for 'use default value', and store the result value
@@ -835,8 +835,8 @@ def copy_action_frame(ob, action_name, src_frame_num, loc_mult, rot_mult, scl_po
     # set Armature Pose properties, and keyframe if needed - these keyframes will automatically replace any keyframes
     # created by 'F Curves to reset' code
     for data_path, indexed_values in frame_data.items():
-        fc_tokens, _ = lex_py_attributes(data_path)
-        bone_name = data_path[ fc_tokens[2][0]+2 : fc_tokens[2][1]-2 ]
+        dp_info = parse_data_path(data_path)
+        bone_name = dp_info.bone_name
         bone_side = bone_side_lookup[bone_name][0]
         if mirror and bone_side != -1:
             bone_name = bone_base_lr_lookup[bone_side_lookup[bone_name][1]][1 - bone_side]
@@ -850,10 +850,10 @@ def copy_action_frame(ob, action_name, src_frame_num, loc_mult, rot_mult, scl_po
             bone_side_mult = left_factor
         else:
             bone_side_mult = right_factor
-        thing_to_keyframe = get_thing_to_keyframe(ob, data_path, fc_tokens, bone_name)
+        thing_to_keyframe = get_thing_to_keyframe(ob, dp_info, bone_name)
         if thing_to_keyframe is None:
             continue
-        prop_name = data_path[data_path.rfind(".")+1:]
+        prop_name = dp_info.prop_name
         new_quat_value = None
         if prop_name == "rotation_quaternion":
             new_quat_value = get_scaled_quaternion_from_indexed_values(indexed_values, rot_mult * bone_side_mult)
@@ -932,7 +932,7 @@ def copy_action_frame(ob, action_name, src_frame_num, loc_mult, rot_mult, scl_po
                     fc.keyframe_points.insert(frame, value, keyframe_type='KEYFRAME')
             # only set property values
             else:
-                if len(fc_tokens) == 4:
+                if dp_info.kind == DATA_PATH_KIND_BONE:
                     if prop_name == 'rotation_mode' and value in ROTATION_MODE_STRINGS:
                         setattr(thing_to_keyframe, prop_name, ROTATION_MODE_STRINGS[value])
                     else:
@@ -941,7 +941,7 @@ def copy_action_frame(ob, action_name, src_frame_num, loc_mult, rot_mult, scl_po
                             prop[array_index] = value
                         else:
                             setattr(thing_to_keyframe, prop_name, value)
-                elif len(fc_tokens) == 6 and data_path[ fc_tokens[3][0] : fc_tokens[3][1] ] == 'constraints':
+                elif dp_info.kind == DATA_PATH_KIND_CONSTRAINT:
                     prop = getattr(thing_to_keyframe, prop_name)
                     if hasattr(prop, "__len__"):
                         prop[array_index] = value
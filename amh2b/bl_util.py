@@ -21,6 +21,8 @@ import traceback
 
 import bpy
 
+from .lex_py_attributes import DATA_PATH_KIND_BONE, DATA_PATH_KIND_CONSTRAINT
+
 def strip_line_comment(src_line):
     dest_line = ""
     state_vars = { "backslash": False, "quote": False, "double_quote": False }
@@ -139,10 +141,24 @@ def keyframe_shapekey_value(ob, shapekey_name, frame, value):
     else:
         kp = fc.keyframe_points.insert(frame=frame, value=value)
 
-def get_thing_to_keyframe(ob, datapath, tokens, bone_name):
-    if bone_name not in ob.pose.bones:
+# returns PoseBone or bone Constraint that owns the property of parsed F-Curve data path 'dp_info' (see
+# parse_data_path() in lex_py_attributes.py), or None. 'bone_name' overrides bone name of data path, e.g. when mirrored
+def get_thing_to_keyframe(ob, dp_info, bone_name=None):
+    if bone_name is None:
+        bone_name = dp_info.bone_name
+    pose_bone = ob.pose.bones.get(bone_name)
+    if pose_bone is None:
         return None
 # e.g.
+#     pose.bones['Bone'].location
+    if dp_info.kind == DATA_PATH_KIND_BONE:
+        return pose_bone
+# e.g.
+#     pose.bones['Bone'].constraints['Copy Transforms'].influence
+    elif dp_info.kind == DATA_PATH_KIND_CONSTRAINT:
+        return pose_bone.constraints.get(dp_info.constraint_name)
+    return None
+# e.g.
 #     pose.bones['Bone'].location
     if len(tokens) == 4:
         return ob.pose.bones[bone_name]
@@ -26,5 +26,15 @@ SC_DSKEY = "DSKey"
 SC_TEMP_SK_X = "TempSK_X"
 SC_TEMP_SK_Y = "TempSK_Y"
 SC_TEMP_SK_Z = "TempSK_Z"
+SC_TEMP_SK_BAKE = "TempSK_Bake"
+
+# Deform Shape Keys bind map cache, stored as Object custom properties
+SC_BIND_CACHE_KEY = "AMH2B_BindCacheKey"
+SC_BIND_CACHE_MAP = "AMH2B_BindCacheMap"
+# Deform Shape Keys incremental bake fingerprints, stored as Object custom properties
+SC_BAKE_SETTINGS_KEY = "AMH2B_BakeSettingsKey"
+SC_BAKE_FINGERPRINTS = "AMH2B_BakeFingerprints"
+# Copy Keys surface binding cache, stored as Object custom property of destination object, most recent binding only
+SC_SURFACE_BIND_CACHE = "AMH2B_SurfaceBindCache"
 
 ADDON_BASE_FILE = __file__
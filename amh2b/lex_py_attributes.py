@@ -16,6 +16,8 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+from collections import namedtuple
+from functools import lru_cache
 import numpy
 import re
 
@@ -270,6 +272,40 @@ def lex_py_attributes(input_str, verbose=0):
     if verbose > 1: print("x   current_state  final = " + str(current_state))
     return state_vars[OUTPUT_VAR], state_vars[ERROR_VAR]
 
+# maximum number of distinct data paths kept in parse_data_path() cache, least recently used are discarded first
+DATA_PATH_CACHE_SIZE = 4096
+
+# kinds of data path, by what the last attribute belongs to
+DATA_PATH_KIND_BONE = "BONE"     # e.g. pose.bones["Bone"].location
+DATA_PATH_KIND_CONSTRAINT = "CONSTRAINT"     # e.g. pose.bones["Bone"].constraints["Copy Transforms"].influence
+
+# result of parse_data_path():
+#   tokens: tuple of attribute (start, end) positions, see lex_py_attributes()
+#   bone_name: name of bone from third attribute, e.g. pose.bones["Bone"], or None if less than three attributes
+#   constraint_name: name of constraint if kind is DATA_PATH_KIND_CONSTRAINT, otherwise None
+#   prop_name: name of last attribute, i.e. text after last '.'
+#   kind: DATA_PATH_KIND_BONE, DATA_PATH_KIND_CONSTRAINT, or None
+DataPathInfo = namedtuple("DataPathInfo", ["tokens", "bone_name", "constraint_name", "prop_name", "kind"])
+
+# do:     apply lexer to F-Curve data path, and get bone name, constraint name, property name, and kind of data path.
+#         Results are cached, so each distinct data path is lexed only once
+# output: DataPathInfo, see above
+@lru_cache(maxsize=DATA_PATH_CACHE_SIZE)
+def parse_data_path(data_path):
+    tokens, _ = lex_py_attributes(data_path)
+    tokens = tuple(tokens)
+    bone_name = None
+    if len(tokens) >= 3:
+        bone_name = data_path[ tokens[2][0]+2 : tokens[2][1]-2 ]
+    constraint_name = None
+    kind = None
+    if len(tokens) == 4:
+        kind = DATA_PATH_KIND_BONE
+    elif len(tokens) == 6 and data_path[ tokens[3][0] : tokens[3][1] ] == 'constraints':
+        kind = DATA_PATH_KIND_CONSTRAINT
+        constraint_name = data_path[ tokens[4][0]+2 : tokens[4][1]-2 ]
+    return DataPathInfo(tokens, bone_name, constraint_name, data_path[data_path.rfind(".")+1:], kind)
+
 #### test suite follows ####
 
 test_data = [
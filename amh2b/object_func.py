@@ -16,8 +16,24 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+from numpy import empty as np_empty
+from numpy import float32 as np_float32
+from numpy import int32 as np_int32
+
 import bpy
 
+# returns numpy array of mesh vertex locations, with shape (vertex_count, 3)
+def get_mesh_vert_cos(mesh):
+    cos = np_empty(len(mesh.vertices) * 3, dtype=np_float32)
+    mesh.vertices.foreach_get("co", cos)
+    return cos.reshape(-1, 3)
+
+# returns numpy array of mesh edge vertex indexes, with shape (edge_count, 2)
+def get_mesh_edge_verts(mesh):
+    edge_verts = np_empty(len(mesh.edges) * 2, dtype=np_int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    return edge_verts.reshape(-1, 2)
+
 def check_create_basis_shape_key(obj):
     if obj.data.shape_keys is None:
         sk_basis = obj.shape_key_add(name='Basis')
@@ -47,3 +63,116 @@ def is_object_in_sub_collection(ob, coll):
         if ob.name in [ i.name for i in cr_coll.objects]:
             return True
     return False
+
+# returns list of Objects referenced by Object / Collection type pointer properties of 'struct' (e.g. modifier,
+# constraint), and by Object / Collection type custom properties (e.g. geometry nodes modifier inputs). All Objects
+# of referenced Collections are included
+def get_struct_object_pointers(struct):
+    ref_obs = []
+    ref_colls = []
+    for prop in struct.bl_rna.properties:
+        if prop.type != 'POINTER':
+            continue
+        type_name = getattr(prop.fixed_type, "identifier", None)
+        if type_name == 'Object':
+            ref_obs.append(getattr(struct, prop.identifier, None))
+        elif type_name == 'Collection':
+            ref_colls.append(getattr(struct, prop.identifier, None))
+    # e.g. Armature constraint targets
+    for target in getattr(struct, "targets", []):
+        ref_obs.append(getattr(target, "target", None))
+    # only ID data blocks and geometry nodes modifiers support custom properties, e.g. geometry nodes inputs
+    if isinstance(struct, (bpy.types.ID, bpy.types.NodesModifier)):
+        for val in struct.values():
+            if isinstance(val, bpy.types.Object):
+                ref_obs.append(val)
+            elif isinstance(val, bpy.types.Collection):
+                ref_colls.append(val)
+    for coll in ref_colls:
+        if coll is not None:
+            ref_obs.extend(coll.all_objects)
+    return [ ob for ob in ref_obs if ob is not None ]
+
+# settings structs of physics modifiers that may reference Objects / Collections, e.g. cloth collision collection,
+# and effector weights collection
+PHYSICS_MOD_SETTINGS_PATHS = ["settings", "settings.effector_weights", "collision_settings",
+                              "particle_system.settings", "particle_system.settings.effector_weights",
+                              "domain_settings", "domain_settings.effector_weights"]
+
+def get_physics_mod_settings_structs(mod):
+    structs = []
+    for path in PHYSICS_MOD_SETTINGS_PATHS:
+        struct = mod
+        for attr in path.split("."):
+            struct = getattr(struct, attr, None)
+            if struct is None:
+                break
+        if struct is not None:
+            structs.append(struct)
+    # e.g. Dynamic Paint canvas surface brush collection
+    canvas_settings = getattr(mod, "canvas_settings", None)
+    if canvas_settings is not None:
+        for surface in canvas_settings.canvas_surfaces:
+            structs.extend([ surface, surface.effector_weights ])
+    return structs
+
+def get_anim_driver_objects(anim_id):
+    ref_obs = []
+    if anim_id is None or anim_id.animation_data is None:
+        return ref_obs
+    for fc in anim_id.animation_data.drivers:
+        for var in fc.driver.variables:
+            for target in var.targets:
+                if isinstance(target.id, bpy.types.Object):
+                    ref_obs.append(target.id)
+    return ref_obs
+
+# modifiers that are affected by collision objects and force fields of scene
+PHYSICS_MOD_TYPES = ['CLOTH', 'DYNAMIC_PAINT', 'FLUID', 'PARTICLE_SYSTEM', 'SOFT_BODY']
+
+# returns set of Objects that evaluation of 'obj' depends on, including 'obj': parents, modifier objects,
+# constraint targets (object and pose bone constraints), driver variable targets, and objects of referenced
+# collections (e.g. Boolean modifier collection), recursively. If physics modifiers are used, then collision and force
+# field objects of 'scene' are included, and objects of physics settings collections
+def get_object_dependency_closure(scene, obj):
+    closure = set()
+    check_obs = [obj]
+    while len(check_obs) > 0:
+        ob = check_obs.pop()
+        if ob in closure:
+            continue
+        closure.add(ob)
+        if ob.parent is not None:
+            check_obs.append(ob.parent)
+        for mod in ob.modifiers:
+            check_obs.extend(get_struct_object_pointers(mod))
+            if mod.type in PHYSICS_MOD_TYPES:
+                for settings in get_physics_mod_settings_structs(mod):
+                    check_obs.extend(get_struct_object_pointers(settings))
+                check_obs.extend([ o for o in scene.objects if 'COLLISION' in [ m.type for m in o.modifiers ] or
+                    (o.field is not None and o.field.type != 'NONE') ])
+        for con in ob.constraints:
+            check_obs.extend(get_struct_object_pointers(con))
+        if ob.pose is not None:
+            for pose_bone in ob.pose.bones:
+                for con in pose_bone.constraints:
+                    check_obs.extend(get_struct_object_pointers(con))
+        check_obs.extend(get_anim_driver_objects(ob))
+        check_obs.extend(get_anim_driver_objects(ob.data))
+        if ob.type == 'MESH' and ob.data.shape_keys is not None:
+            check_obs.extend(get_anim_driver_objects(ob.data.shape_keys))
+    return closure
+
+# disable in viewports all Objects of 'scene' that are not in 'keep_objects', so the depsgraph evaluates only
+# 'keep_objects'. Disabled Objects are appended to 'disabled_obs' as they are disabled, so they can be restored with
+# restore_object_evaluation() even if an error occurs. Linked library Objects are read-only, and are not disabled
+def isolate_object_evaluation(scene, keep_objects, disabled_obs):
+    for ob in scene.objects:
+        if ob in keep_objects or ob.hide_viewport or ob.library is not None:
+            continue
+        ob.hide_viewport = True
+        disabled_obs.append(ob)
+
+def restore_object_evaluation(disabled_obs):
+    for ob in disabled_obs:
+        ob.hide_viewport = False
@@ -0,0 +1,57 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Bake Deform ShapeKeys parallel worker script, run by headless Blender:
+#   blender --background file.blend --python bake_worker.py -- obj_name start_frame end_frame bind_filepath \
+#       is_dynamic extra_accuracy use_analytic cache_filepath
+# Bakes one chunk of frames with given bind map, and writes vertex offsets to bake cache file.
+
+import importlib
+import os
+import sys
+
+from numpy import load as np_load
+
+import bpy
+
+def main(argv):
+    obj_name, start_frame_num, end_frame_num, bind_filepath, is_dynamic, extra_accuracy, use_analytic, \
+        cache_filepath = argv[argv.index("--")+1:]
+    start_frame_num = int(start_frame_num)
+    end_frame_num = int(end_frame_num)
+    # import addon's shape key functions from addon directory, without registering addon
+    addon_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    sk_func = importlib.import_module(os.path.basename(addon_dir) + ".shape_key.func")
+
+    obj = bpy.data.objects[obj_name]
+    vert_matches = np_load(bind_filepath)
+    if is_dynamic == "1":
+        bind_frames = sk_func.dynamic_bind_frames(obj, range(start_frame_num, end_frame_num+1), vert_matches,
+            int(extra_accuracy), use_analytic == "1")
+    else:
+        bind_frames = sk_func.simple_bind_frames(obj, range(start_frame_num, end_frame_num+1), vert_matches)
+    sk_func.check_create_basis_shape_key(obj)
+    rest_cos = sk_func.get_key_block_cos(obj.data.shape_keys.reference_key)
+    err_msg = sk_func.write_bake_cache(cache_filepath, bind_frames, end_frame_num - start_frame_num + 1, rest_cos)
+    if err_msg is not None:
+        print(err_msg)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv)
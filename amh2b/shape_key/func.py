@@ -16,20 +16,40 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import hashlib
+import itertools
 import re
 import math
 import mathutils
-from mathutils import Vector
-from numpy import subtract as np_subtract
+from numpy import add as np_add
 from numpy import array as np_array
+from numpy import bincount as np_bincount
+from numpy import einsum as np_einsum
+from numpy import eye as np_eye
+from numpy import empty as np_empty
+from numpy import float32 as np_float32
+from numpy import float64 as np_float64
+from numpy import floor as np_floor
+from numpy import int32 as np_int32
+from numpy import int64 as np_int64
+from numpy import ones as np_ones
+from numpy import stack as np_stack
+from numpy import unique as np_unique
+from numpy import zeros as np_zeros
+from numpy.linalg import norm as np_norm
 
-import bmesh
 import bpy
 
-from ..append_from_file_func import append_object_from_blend_file
-from ..const import (FC_MATCH_DIST, SC_TEMP_SK_X, SC_TEMP_SK_Y, SC_TEMP_SK_Z)
-from ..object_func import delete_all_objects_except, check_create_basis_shape_key
-from ..template import get_searchable_object_name
+from ..append_from_file_func import append_auto_search_objects, remove_appended_data
+from ..const import (FC_MATCH_DIST, SC_BAKE_FINGERPRINTS, SC_BAKE_SETTINGS_KEY, SC_BIND_CACHE_KEY,
+    SC_BIND_CACHE_MAP, SC_SURFACE_BIND_CACHE, SC_TEMP_SK_BAKE, SC_TEMP_SK_X, SC_TEMP_SK_Y, SC_TEMP_SK_Z)
+from ..object_func import (check_create_basis_shape_key, get_mesh_edge_verts, get_mesh_vert_cos,
+    get_object_dependency_closure, isolate_object_evaluation, restore_object_evaluation)
+from .func_bake_cache import (get_bake_cache_filepaths, read_bake_cache_frames, read_bake_cache_header,
+    write_bake_cache)
+from .func_bake_parallel import read_parallel_bake_frames, remove_parallel_bake_files, run_parallel_bake
+from .func_bake_pca import get_pca_deform_basis
+from .func_surface_bind import get_mesh_tri_verts, get_surface_bind_deltas, get_surface_binding
 
 SK_FUNC_APPLY_MOD = "SK_FUNC_APPLY_MOD"
 SK_FUNC_BAKE = "SK_FUNC_BAKE"
@@ -43,6 +63,23 @@ SK_FUNC_ITEMS = [
     (SK_FUNC_DELETE, "Delete", ""),
 ]
 
+SK_BAKE_TARGET_SHAPE_KEYS = "SHAPE_KEYS"
+SK_BAKE_TARGET_CACHE_FILE = "CACHE_FILE"
+SK_BAKE_TARGET_ITEMS = [
+    (SK_BAKE_TARGET_SHAPE_KEYS, "Shape Keys", "Bake mesh deform shapes to ShapeKeys"),
+    (SK_BAKE_TARGET_CACHE_FILE, "Cache File", "Stream mesh deform offsets (deformed minus rest vertex " \
+         "locations) to memory mapped .npy file, with .json header file. Use Load Cache to create ShapeKeys or " \
+         "Attributes from cache file"),
+]
+
+SK_CACHE_LOAD_SHAPE_KEYS = "SHAPE_KEYS"
+SK_CACHE_LOAD_ATTRIBUTES = "ATTRIBUTES"
+SK_CACHE_LOAD_TYPE_ITEMS = [
+    (SK_CACHE_LOAD_SHAPE_KEYS, "Shape Keys", "Load cached frames as ShapeKeys"),
+    (SK_CACHE_LOAD_ATTRIBUTES, "Attributes", "Load cached frames as FLOAT_VECTOR Attributes, on POINT domain, " \
+         "with deformed vertex locations"),
+]
+
 def is_name_prefix_match(name, prefix):
     if name == prefix or re.match(prefix + "\w*", name):
         return True
@@ -69,108 +106,163 @@ def sk_func_delete(sel_obj_list, delete_prefix):
                      len(x.data.shape_keys.key_blocks) > 1):
         delete_shapekeys_by_prefix(mesh_obj, delete_prefix)
 
-def v_distance(point1, point2) -> float:
-    return math.sqrt((point2[0] - point1[0]) ** 2 + (point2[1] - point1[1]) ** 2 + (point2[2] - point1[2]) ** 2)
-
-# returns [(vertex_index, vertex_scale), ...]
+# returns numpy array of ShapeKey vertex locations, with shape (vertex_count, 3)
+def get_key_block_cos(key_block):
+    cos = np_empty(len(key_block.data) * 3, dtype=np_float32)
+    key_block.data.foreach_get("co", cos)
+    return cos.reshape(-1, 3)
+
+# returns numpy array with sum of connected edge lengths, per vertex
+def get_vert_edge_len_sums(mesh):
+    cos = get_mesh_vert_cos(mesh).astype(np_float64)
+    edge_verts = get_mesh_edge_verts(mesh)
+    edge_lens = np_norm(cos[edge_verts[:, 1]] - cos[edge_verts[:, 0]], axis=1)
+    # add each edge length to both of its vertices
+    vert_count = len(mesh.vertices)
+    return np_bincount(edge_verts[:, 0], weights=edge_lens, minlength=vert_count) + \
+        np_bincount(edge_verts[:, 1], weights=edge_lens, minlength=vert_count)
+
+# returns numpy array of vertex scales, one scale per vertex, with scale = 1.0 for vertexes that do not need scaling
 # src_obj and dest_obj must have the same topology
-def get_vertex_difference_scales(src_obj, dst_obj):
-    src_vert_edg_len_sum = [0] * len(src_obj.data.vertices)
-    dst_vert_edg_len_sum = [0] * len(src_obj.data.vertices)
-    # iterate over all edges, adding each edge length to both of its vertices
-    for i in range(len(src_obj.data.edges)):
-        ed = src_obj.data.edges[i]
-        d = v_distance(src_obj.data.vertices[ed.vertices[0]].co, src_obj.data.vertices[ed.vertices[1]].co)
-        src_vert_edg_len_sum[ed.vertices[0]] = src_vert_edg_len_sum[ed.vertices[0]] + d
-        src_vert_edg_len_sum[ed.vertices[1]] = src_vert_edg_len_sum[ed.vertices[1]] + d
-
-        ed = dst_obj.data.edges[i]
-        d = v_distance(dst_obj.data.vertices[ed.vertices[0]].co, dst_obj.data.vertices[ed.vertices[1]].co)
-        dst_vert_edg_len_sum[ed.vertices[0]] = dst_vert_edg_len_sum[ed.vertices[0]] + d
-        dst_vert_edg_len_sum[ed.vertices[1]] = dst_vert_edg_len_sum[ed.vertices[1]] + d
-
-    # get the difference in scales, per vertex
-    output_list = []
-    for i in range(len(src_vert_edg_len_sum)):
-        # if scale is same then ignore this vert
-        if src_vert_edg_len_sum[i] == dst_vert_edg_len_sum[i]:
-            continue
-        # prevent divide by zero
-        if src_vert_edg_len_sum[i] == 0:
-            continue
-        # add to output list
-        output_list.append((i, dst_vert_edg_len_sum[i] / src_vert_edg_len_sum[i]))
-
-    return output_list
-
-def copy_shapekeys_by_name_prefix(context, src_obj, dest_objects, copy_prefix, adapt_size):
+def get_vertex_difference_scale_array(src_obj, dst_obj):
+    src_vert_edg_len_sum = get_vert_edge_len_sums(src_obj.data)
+    dst_vert_edg_len_sum = get_vert_edge_len_sums(dst_obj.data)
+    # get the difference in scales, per vertex, ignoring verts with same scale and preventing divide by zero
+    vert_scales = np_ones(len(src_vert_edg_len_sum), dtype=np_float64)
+    scale_verts = (src_vert_edg_len_sum != dst_vert_edg_len_sum) & (src_vert_edg_len_sum != 0)
+    vert_scales[scale_verts] = dst_vert_edg_len_sum[scale_verts] / src_vert_edg_len_sum[scale_verts]
+    return vert_scales
+
+# set ShapeKey slider range in an order that avoids clamping of one slider limit by the other slider limit
+def set_shape_key_slider_range(key_block, slider_min, slider_max):
+    if slider_min < key_block.slider_max:
+        key_block.slider_min = slider_min
+        key_block.slider_max = slider_max
+    else:
+        key_block.slider_max = slider_max
+        key_block.slider_min = slider_min
+
+# returns hash string of everything that surface binding of 'dest_obj' to 'src_obj' depends on
+def get_surface_bind_cache_key(src_cos, src_tri_verts, dest_cos):
+    h = hashlib.sha1()
+    h.update(src_cos.tobytes())
+    h.update(src_tri_verts.tobytes())
+    h.update(dest_cos.tobytes())
+    return h.hexdigest()
+
+# returns (tri_verts, bary_weights) binding each vertex of 'dest_obj' to surface of 'src_obj', see
+# get_surface_binding(). Only the most recent binding is cached on 'dest_obj', and it is re-used if source object,
+# source mesh, destination mesh, and relative transform of objects are unchanged
+def get_cached_surface_binding(src_obj, dest_obj):
+    src_cos = get_mesh_vert_cos(src_obj.data)
+    src_tri_verts = get_mesh_tri_verts(src_obj.data)
+    # destination vertex locations in source object space
+    dest_to_src = np_array(src_obj.matrix_world.inverted() @ dest_obj.matrix_world, dtype=np_float32)
+    dest_cos = get_mesh_vert_cos(dest_obj.data) @ dest_to_src[:3, :3].T + dest_to_src[:3, 3]
+    cache_key = get_surface_bind_cache_key(src_cos, src_tri_verts, dest_cos)
+    bind_cache = dest_obj.get(SC_SURFACE_BIND_CACHE)
+    if bind_cache is not None and bind_cache.get("source") == src_obj.name and bind_cache.get("key") == cache_key:
+        return np_array(bind_cache["tri_verts"].to_list(), dtype=np_int32).reshape(-1, 3), \
+            np_array(bind_cache["weights"].to_list(), dtype=np_float32).reshape(-1, 3)
+    tri_verts, bary_weights = get_surface_binding(src_cos, src_tri_verts, dest_cos)
+    # replace previous binding, so cache size does not grow with number of source objects
+    dest_obj[SC_SURFACE_BIND_CACHE] = { "source": src_obj.name, "key": cache_key,
+                                        "tri_verts": tri_verts.reshape(-1).tolist(),
+                                        "weights": bary_weights.reshape(-1).tolist() }
+    return tri_verts, bary_weights
+
+# remove cached surface binding from all 'objects', returns number of objects that had a cached binding
+def clear_surface_bind_cache(objects):
+    count = 0
+    for ob in objects:
+        if SC_SURFACE_BIND_CACHE in ob:
+            del ob[SC_SURFACE_BIND_CACHE]
+            count += 1
+    return count
+
+# copy ShapeKeys by name prefix from src_obj to all dest_objects, without using bpy.ops, so no selection or active
+# object changes are needed. Same as 'Transfer Shape Key' operator in 'Offset' mode: ShapeKey offsets from source
+# mesh vertex locations are added to destination mesh vertex locations. If 'surface_bind' is True, then destination
+# mesh may have different topology, and offsets are interpolated from nearest point on source mesh surface.
+# Returns error message string, or None
+def copy_shapekeys_by_name_prefix(src_obj, dest_objects, copy_prefix, adapt_size, surface_bind=False):
     if src_obj.data.shape_keys is None:
         return
+    src_key_blocks = [ sk for sk in src_obj.data.shape_keys.key_blocks
+                       if sk.name != 'Basis' and is_name_prefix_match(sk.name, copy_prefix) ]
+    if len(src_key_blocks) == 0:
+        return
+    # surface binding needs at least one face on source mesh
+    if surface_bind and len(get_mesh_tri_verts(src_obj.data)) == 0:
+        return "Cannot Surface Bind to source object (" + src_obj.name + "), source mesh has no faces"
+    # read source ShapeKey offsets once, and re-use them for all destination objects
+    src_cos = get_mesh_vert_cos(src_obj.data)
+    src_key_deltas = [ get_key_block_cos(sk) - src_cos for sk in src_key_blocks ]
 
-    # keep src_object selected throughout for loop, only switching dest_object select on and off
-    src_obj.select_set(True)
     for dest_obj in dest_objects:
-        # skip destination mesh objects with different numbers of vertices
-        dvc = len(dest_obj.data.vertices)
-        svc = len(src_obj.data.vertices)
-        if dvc != svc:
-            print("copy_shapekeys_by_name_prefix(): Cannot copy shapekeys from source ("+src_obj.name+
-                ") to dest ("+dest_obj.name+"), source vertex count ("+str(svc)+
-                ") doesn't equal destination vertex count ("+str(dvc)+").")
-            continue
-
-        # skip destination mesh objects with different numbers of edges
-        dec = len(dest_obj.data.edges)
-        sec = len(src_obj.data.edges)
-        if dec != sec:
-            print("copy_shapekeys_by_name_prefix(): Cannot copy shapekeys from source ("+src_obj.name+
-                ") to dest ("+dest_obj.name+"), source edge count ("+str(sec)+
-                ") doesn't equal destination edge count ("+str(dec)+").")
-            continue
-
-        # get the scaling needed, per vertex, to "fit" the shape key of the src_object to the dest_object
-        vert_diff_scales = get_vertex_difference_scales(src_obj, dest_obj)
-
-        show_temp = dest_obj.show_only_shape_key
-        dest_obj.select_set(True)
-        context.view_layer.objects.active = dest_obj
-        check_create_basis_shape_key(dest_obj)
-        for sk in src_obj.data.shape_keys.key_blocks:
-            if sk.name == 'Basis':
+        if surface_bind:
+            # bind destination vertexes to source surface once, and re-use binding for all ShapeKeys
+            tri_verts, bary_weights = get_cached_surface_binding(src_obj, dest_obj)
+            # rotate and scale source offsets to destination object space
+            src_to_dest = np_array((dest_obj.matrix_world.inverted() @ src_obj.matrix_world).to_3x3(),
+                                   dtype=np_float32)
+        else:
+            # skip destination mesh objects with different numbers of vertices
+            dvc = len(dest_obj.data.vertices)
+            svc = len(src_obj.data.vertices)
+            if dvc != svc:
+                print("copy_shapekeys_by_name_prefix(): Cannot copy shapekeys from source ("+src_obj.name+
+                    ") to dest ("+dest_obj.name+"), source vertex count ("+str(svc)+
+                    ") doesn't equal destination vertex count ("+str(dvc)+").")
                 continue
-            if is_name_prefix_match(sk.name, copy_prefix):
-                src_obj.active_shape_key_index = src_obj.data.shape_keys.key_blocks.find(sk.name)
-                bpy.ops.object.shape_key_transfer()
 
-            # if not adapt size then skip start next iteration
-            if not adapt_size:
+            # skip destination mesh objects with different numbers of edges
+            dec = len(dest_obj.data.edges)
+            sec = len(src_obj.data.edges)
+            if dec != sec:
+                print("copy_shapekeys_by_name_prefix(): Cannot copy shapekeys from source ("+src_obj.name+
+                    ") to dest ("+dest_obj.name+"), source edge count ("+str(sec)+
+                    ") doesn't equal destination edge count ("+str(dec)+").")
                 continue
 
+        check_create_basis_shape_key(dest_obj)
+        dest_key_blocks = dest_obj.data.shape_keys.key_blocks
+        dest_cos = get_mesh_vert_cos(dest_obj.data).astype(np_float64)
+        # get the scaling needed, per vertex, to "fit" the shape key of the src_object to the dest_object. Not used
+        # with surface binding, because scaling is by ratio of connected edge lengths of same vertex in both meshes
+        if adapt_size and not surface_bind:
+            vert_diff_scales = get_vertex_difference_scale_array(src_obj, dest_obj)[:, None]
+            basis_cos = get_key_block_cos(dest_key_blocks[0]).astype(np_float64)
+
+        new_key_blocks = {}
+        for sk, delta_cos in zip(src_key_blocks, src_key_deltas):
+            new_sk = dest_obj.shape_key_add(name=sk.name, from_mix=False)
+            new_sk.interpolation = sk.interpolation
+            new_sk.vertex_group = sk.vertex_group
+            set_shape_key_slider_range(new_sk, sk.slider_min, sk.slider_max)
+            if surface_bind:
+                delta_cos = get_surface_bind_deltas(delta_cos, tri_verts, bary_weights) @ src_to_dest.T
+            sk_cos = dest_cos + delta_cos
             # adjust for scale differences between source mesh and destination mesh, per vertex
-            sk_index = len(dest_obj.data.shape_keys.key_blocks)-1
-            for v_index, v_scale in vert_diff_scales:
-                sk_loc = dest_obj.data.shape_keys.key_blocks[sk_index].data[v_index].co
-                original_loc = dest_obj.data.shape_keys.key_blocks[0].data[v_index].co
-                delta_loc = np_subtract(sk_loc, original_loc)
-                dest_obj.data.shape_keys.key_blocks[sk_index].data[v_index].co = (v_scale * delta_loc[0] + original_loc[0],
-                    v_scale * delta_loc[1] + original_loc[1], v_scale * delta_loc[2] + original_loc[2])
-
-        dest_obj.select_set(False)
-        # bpy.ops.object.shape_key_transfer will set show_only_shape_key to true, so reset to previous value
-        dest_obj.show_only_shape_key = show_temp
-
-    src_obj.select_set(False)
-
-def copy_shape_keys(context, src_object, dest_objects, copy_prefix, adapt_size):
+            if adapt_size and not surface_bind:
+                sk_cos = (sk_cos - basis_cos) * vert_diff_scales + basis_cos
+            new_sk.data.foreach_set("co", sk_cos.astype(np_float32).ravel())
+            new_key_blocks[sk.name] = new_sk
+
+        # set relative keys after all keys are copied, because relative key may be one of the copied keys
+        for sk in src_key_blocks:
+            rel_key = new_key_blocks.get(sk.relative_key.name)
+            if rel_key is None:
+                rel_key = dest_key_blocks.get(sk.relative_key.name, dest_key_blocks[0])
+            new_key_blocks[sk.name].relative_key = rel_key
+        dest_obj.data.update()
+
+def copy_shape_keys(context, src_object, dest_objects, copy_prefix, adapt_size, surface_bind):
     old_3dview_mode = context.object.mode
     bpy.ops.object.mode_set(mode='OBJECT')
-
-    # de-select all objects because copying shape keys requires bpy.ops.object.shape_key_transfer,
-    # and this requires exactly two specific objects be selected per shape key copy
-    bpy.ops.object.select_all(action='DESELECT')
-
-    copy_shapekeys_by_name_prefix(context, src_object, dest_objects, copy_prefix, adapt_size)
+    result = copy_shapekeys_by_name_prefix(src_object, dest_objects, copy_prefix, adapt_size, surface_bind)
     bpy.ops.object.mode_set(mode=old_3dview_mode)
+    return result
 
 def search_file_for_auto_sk(sel_obj_list, chosen_blend_file, name_prefix, adapt_size, swap_autoname_ext):
     old_3dview_mode = bpy.context.object.mode
@@ -179,111 +271,170 @@ def search_file_for_auto_sk(sel_obj_list, chosen_blend_file, name_prefix, adapt_
     # copy list of selected objects, minus the active object
     selection_list = [ob for ob in sel_obj_list if ob.type == 'MESH']
 
-    # keep a list of all objects in the Blend file, before objects are appended
-    all_objects_list_before = [ ob for ob in bpy.data.objects ]
-
-    bpy.ops.object.select_all(action='DESELECT')
+    # open file once, and append all needed ShapeKey mesh objects
+    src_objects, appended_ids = append_auto_search_objects(chosen_blend_file, selection_list, swap_autoname_ext)
+    # group destination objects by source object, so source ShapeKeys are read once per source object
+    src_dest_objects = {}
     for sel in selection_list:
-        search_name = get_searchable_object_name(sel.name)
-        # if the desired ShapeKey mesh object name is already used then rename it before appending from file,
-        # and rename later after the appended object is deleted
-        test_obj = bpy.data.objects.get(search_name)
-        if test_obj is not None:
-            test_obj.name = "TempRenameName"
-
-        # if cannot load mesh object from file...
-        append_object_from_blend_file(chosen_blend_file, search_name)
-        appended_obj = bpy.data.objects.get(search_name)
-        if appended_obj is None:
-            # if "swap autoname ext" is enabled then check object name, and if it follows the
-            # '.001', '.002', etc. format, then try to swap again but with '.XYZ' extension removed
-            if swap_autoname_ext and re.match(".*\.[0-9]{3}", search_name):
-                no_ext_search_name = search_name[0:len(search_name)-4]
-                append_object_from_blend_file(chosen_blend_file, no_ext_search_name)
-                appended_obj = bpy.data.objects.get(no_ext_search_name)
-            else:
-                # if rename occurred, then undo rename
-                if test_obj is not None:
-                    test_obj.name = search_name
-                continue
-
-        # use bpy.context.selected_objects instead of sel_obj_list because bpy.context.selected_objects will change
-        # as objects are selected/deselected
-        appended_selection_list = [ob for ob in bpy.context.selected_objects]
-
-        # de-select all objects because copying shape keys requires bpy.ops.object.shape_key_transfer,
-        # and this requires exactly two specific objects be selected per shape key copy
-        bpy.ops.object.select_all(action='DESELECT')
-        copy_shapekeys_by_name_prefix(bpy.context, appended_obj, [sel], name_prefix, adapt_size)
-        bpy.ops.object.select_all(action='DESELECT')
-
-        # re-select the objects that were appended
-        for ob in appended_selection_list:
-            ob.select_set(True)
-
-        # appended object may have pulled in other objects as dependencies, so delete all appended objects
-        delete_all_objects_except(all_objects_list_before)
+        if sel in src_objects:
+            src_dest_objects.setdefault(src_objects[sel], []).append(sel)
+    for src_obj, dest_objects in src_dest_objects.items():
+        copy_shapekeys_by_name_prefix(src_obj, dest_objects, name_prefix, adapt_size)
 
-        # if an object was named in order to do appending then fix name
-        if test_obj is not None:
-            test_obj.name = search_name
+    # appended objects may have pulled in other data as dependencies, so delete all appended data
+    remove_appended_data(appended_ids)
 
     bpy.ops.object.mode_set(mode=old_3dview_mode)
 
-def get_mod_verts(obj):
+# get vertex locations of 'obj' with modifiers applied (evaluated mesh), as numpy array with shape (vertex_count, 3).
+# If 'out_cos' array is given, and is the right size, then locations are read into 'out_cos' and it is returned,
+# so the same array can be re-used for every frame of a bake
+def get_mod_verts(obj, out_cos=None):
     depsgraph = bpy.context.evaluated_depsgraph_get()
     object_eval = obj.evaluated_get(depsgraph)
-    obj_mod_mesh = bpy.data.meshes.new_from_object(object_eval)
-    verts = [Vector([v.co.x, v.co.y, v.co.z]) for v in obj_mod_mesh.vertices]
-    bpy.data.meshes.remove(obj_mod_mesh)
-    return verts
-
-# return list of (base_mesh_vert_index, modified_mesh_vert_index) tuples
-def get_vert_matches(obj, mask_vgroup_name, mask_include):
+    eval_mesh = object_eval.to_mesh()
+    vert_count = len(eval_mesh.vertices)
+    if out_cos is None or len(out_cos) != vert_count:
+        out_cos = np_empty((vert_count, 3), dtype=np_float32)
+    eval_mesh.vertices.foreach_get("co", out_cos.reshape(-1))
+    object_eval.to_mesh_clear()
+    return out_cos
+
+# returns numpy boolean array, True for each vertex in vertex group given by vert_group_index
+def get_vgroup_member_mask(obj, vert_group_index):
+    in_group = np_zeros(len(obj.data.vertices), dtype=bool)
+    for v in obj.data.vertices:
+        for g in v.groups:
+            if g.group == vert_group_index:
+                in_group[v.index] = True
+                break
+    return in_group
+
+# returns numpy boolean array, True for each base mesh vertex allowed by mask vertex group,
+# or None if mask vertex group is not used
+def get_bind_vert_mask(obj, mask_vgroup_name, mask_include):
+    if mask_vgroup_name == "":
+        return None
+    mask_vgroup = obj.vertex_groups.get(mask_vgroup_name)
+    if mask_vgroup is None:
+        return None
+    in_group = get_vgroup_member_mask(obj, mask_vgroup.index)
+    # include only mask vertex group vertexes, or exclude mask vertex group vertexes
+    if mask_include:
+        return in_group
+    return ~in_group
+
+# return numpy array of [base_mesh_vert_index, modified_mesh_vert_index] pairs, with shape (match_count, 2)
+def get_vert_matches(obj, base_vert_mask):
     # create a KDTree of the base vertices, to efficiently search for overlapping verts
-    base_verts = obj.data.vertices
-    kd = mathutils.kdtree.KDTree(len(base_verts))
-    for v in base_verts:
-        kd.insert((v.co.x, v.co.y, v.co.z), v.index)
+    base_cos = get_mesh_vert_cos(obj.data)
+    kd = mathutils.kdtree.KDTree(len(base_cos))
+    for i, co in enumerate(base_cos):
+        kd.insert(co, i)
     kd.balance()
     # search the modified vertices for overlapping verts and build the "matches" list
     mod_verts = get_mod_verts(obj)
     matches = []
-    i = -1
-    for vco in mod_verts:
-        i = i + 1
-        found_list = kd.find_range(vco, FC_MATCH_DIST)
+    for i, vco in enumerate(mod_verts):
+        _, found_vert_index, found_dist = kd.find(vco)
         # if none found within match distance then goto next iteration
-        if len(found_list) < 1:
+        if found_vert_index is None or found_dist > FC_MATCH_DIST:
+            continue
+        # check if vertex is needed re: mask vertex group
+        if base_vert_mask is not None and not base_vert_mask[found_vert_index]:
             continue
-        found_vert_index = found_list[0][1]
-        if mask_vgroup_name != "":
-            mask_vgroup = obj.vertex_groups.get(mask_vgroup_name)
-            if mask_vgroup is not None:
-                vert_is_in_group = mask_vgroup.index in [i.group for i in obj.data.vertices[found_vert_index].groups]
-                # check if vertex is needed re: mask include
-                if mask_include and not vert_is_in_group:
-                    continue
-                # check if vertex is needed re: mask exclude
-                if not mask_include and vert_is_in_group:
-                    continue
-
         # append match tuple [base_mesh_vert_index, modified_mesh_vert_index]
-        matches.append([found_vert_index, i])
-    return matches
+        matches.append((found_vert_index, i))
+    return np_array(matches, dtype=np_int32).reshape(-1, 2)
+
+# modifier properties that change only UI state, not mesh evaluation
+MOD_SIGNATURE_SKIP_PROPS = ['rna_type', 'is_active', 'is_override_data', 'show_expanded', 'persistent_uid']
+
+# returns string with type, name, and settings of all modifiers of 'obj', in stack order
+def get_modifier_stack_signature(obj):
+    mod_sigs = []
+    for mod in obj.modifiers:
+        prop_sigs = []
+        for prop in mod.bl_rna.properties:
+            if prop.identifier in MOD_SIGNATURE_SKIP_PROPS or prop.type == 'COLLECTION':
+                continue
+            val = getattr(mod, prop.identifier, None)
+            if prop.type == 'POINTER':
+                val = getattr(val, "name", None)
+            elif prop.type == 'ENUM' and prop.is_enum_flag:
+                val = sorted(val)
+            elif getattr(prop, "is_array", False):
+                val = tuple(val)
+            prop_sigs.append((prop.identifier, val))
+        mod_sigs.append((mod.type, mod.name, prop_sigs))
+    return repr(mod_sigs)
+
+# returns hash string of everything that bind vertex matches depend on: mesh topology and vertex locations,
+# modifier stack, bind frame, and mask vertex group
+def get_bind_cache_key(obj, bind_frame_num, base_vert_mask):
+    h = hashlib.sha1()
+    h.update(str(len(obj.data.vertices)).encode())
+    h.update(get_mesh_edge_verts(obj.data).tobytes())
+    h.update(get_mesh_vert_cos(obj.data).tobytes())
+    h.update(get_modifier_stack_signature(obj).encode())
+    h.update(str(bind_frame_num).encode())
+    if base_vert_mask is not None:
+        h.update(base_vert_mask.tobytes())
+    return h.hexdigest()
+
+# returns vert matches stored on 'obj' by previous bake, or None if cache key does not match
+def get_cached_vert_matches(obj, bind_cache_key):
+    if obj.get(SC_BIND_CACHE_KEY) != bind_cache_key or obj.get(SC_BIND_CACHE_MAP) is None:
+        return None
+    return np_array(obj[SC_BIND_CACHE_MAP].to_list(), dtype=np_int32).reshape(-1, 2)
+
+def set_cached_vert_matches(obj, bind_cache_key, vert_matches):
+    # empty arrays cannot be stored as custom property
+    if len(vert_matches) < 1:
+        return
+    obj[SC_BIND_CACHE_KEY] = bind_cache_key
+    obj[SC_BIND_CACHE_MAP] = vert_matches.reshape(-1).tolist()
+
+def get_deform_key_name(add_prefix, frame, append_frame_to_name):
+    if append_frame_to_name:
+        return add_prefix + str(frame).zfill(4)
+    return add_prefix
 
-def create_single_deform_shape_key(obj, add_prefix, vert_matches, mod_verts):
+def create_deform_shape_key(obj, key_name, sk_cos):
     check_create_basis_shape_key(obj)
     # create a shape key
-    sk = obj.shape_key_add(name=add_prefix)
+    sk = obj.shape_key_add(name=key_name, from_mix=False)
     sk.interpolation = 'KEY_LINEAR'
-    # modify shape key vertex positions to match modified (deformed) mesh
-    for base_v_index, mod_v_index in vert_matches:
-        sk.data[base_v_index].co.x = mod_verts[mod_v_index].x
-        sk.data[base_v_index].co.y = mod_verts[mod_v_index].y
-        sk.data[base_v_index].co.z = mod_verts[mod_v_index].z
+    # set shape key vertex positions to modified (deformed) mesh positions
+    sk.data.foreach_set("co", sk_cos.astype(np_float32).reshape(-1))
     return sk
 
+# add keyframes to baked deform shape keys, given as list of (frame, shape_key_name) in frame order.
+# Each shape key has value = 1 on its own frame(s), and value = 0 on the frames of the previous and next shape keys
+# (or the frames immediately before and after, for first and last shape key), so that shape keys blend linearly
+# between baked frames. A shape key may be given for more than one frame (e.g. re-used by dedup)
+def keyframe_deform_shape_keys(obj, frame_keys, linear_interpolation):
+    key_blocks = obj.data.shape_keys.key_blocks
+    key_frames = {}
+    for frame, key_name in frame_keys:
+        key_frames.setdefault(key_name, set()).add(frame)
+    for i, (frame, key_name) in enumerate(frame_keys):
+        prev_frame = frame - 1 if i == 0 else frame_keys[i-1][0]
+        next_frame = frame + 1 if i == len(frame_keys)-1 else frame_keys[i+1][0]
+        sk = key_blocks[key_name]
+        # set values and insert keyframes, value = 0 is not keyed on other frames that use same shape key
+        sk.value = 0
+        for zero_frame in (prev_frame, next_frame):
+            if zero_frame not in key_frames[key_name]:
+                sk.keyframe_insert(data_path='value', frame=zero_frame)
+        sk.value = 1
+        sk.keyframe_insert(data_path='value', frame=frame)
+        if linear_interpolation:
+            fc = obj.data.shape_keys.animation_data.action.fcurves.find(data_path=sk.path_from_id('value'))
+            if fc is not None:
+                for kp in fc.keyframe_points:
+                    kp.interpolation = 'LINEAR'
+
 mod_names = ['ARMATURE', 'CAST', 'CURVE', 'DISPLACE', 'HOOK', 'LAPLACIANDEFORM', 'LATTICE', 'MESH_DEFORM',
     'SHRINKWRAP', 'SIMPLE_DEFORM', 'SMOOTH',
     'CORRECTIVE_SMOOTH', 'LAPLACIANSMOOTH', 'SURFACE_DEFORM', 'WARP', 'WAVE',
@@ -294,155 +445,318 @@ def is_deform_modifier(mod):
         return True
     return False
 
-def simple_bind(obj, add_prefix, start_frame_num, end_frame_num, animate_keys, append_frame_to_name,
-    vert_matches):
-    # create shape keys in the "deform" frames
-    for frame in range(start_frame_num, end_frame_num+1):
-        bpy.context.scene.frame_set(frame)
-        mod_verts = get_mod_verts(obj)
-        prefix = add_prefix
-        if append_frame_to_name:
-            prefix = prefix + str(frame).zfill(4)
-        sk = create_single_deform_shape_key(obj, prefix, vert_matches, mod_verts)
-        # if animating keys then add keyframes before and after the current frame with value = 0, and
-        # add keyframe on current frame with value = 1
-        if animate_keys:
-            # switch the shapekey for it's key_blocks counter-part, so that keyframes will insert correctly
-            sk = obj.data.shape_keys.key_blocks[sk.name]
-            # set values and insert keyframes
-            sk.value = 0
-            sk.keyframe_insert(data_path='value', frame=frame-1)
-            sk.keyframe_insert(data_path='value', frame=frame+1)
-            sk.value = 1
-            sk.keyframe_insert(data_path='value', frame=frame)
-
-def dynamic_bind(obj, add_prefix, start_frame_num, end_frame_num, animate_keys, append_frame_to_name,
-    vert_matches, extra_accuracy):
-    # create a shape key for each axis, with offset of +1.0 along respective axis
+# insert keyframes on shape key 'value', one keyframe per frame in 'frames', with values from 'values'
+def keyframe_shape_key_values(obj, key_name, frames, values, linear_interpolation):
+    sk = obj.data.shape_keys.key_blocks[key_name]
+    # insert first keyframe normally, so animation data and F-Curve are created if needed
+    sk.value = values[0]
+    sk.keyframe_insert(data_path='value', frame=frames[0])
+    fc = obj.data.shape_keys.animation_data.action.fcurves.find(data_path=sk.path_from_id('value'))
+    if fc is None:
+        return
+    # add remaining keyframes in bulk
+    fc.keyframe_points.add(len(frames)-1)
+    key_cos = np_empty(len(frames)*2, dtype=np_float32)
+    key_cos[0::2] = frames
+    key_cos[1::2] = values
+    fc.keyframe_points.foreach_set("co", key_cos)
+    if linear_interpolation:
+        for kp in fc.keyframe_points:
+            kp.interpolation = 'LINEAR'
+    fc.update()
+
+# create a small number of basis shape keys, with keyframed weights per frame, from deform frames 'bind_frames',
+# instead of one shape key per frame. Returns message with shape key count and reconstruction errors
+def create_compressed_deform_shape_keys(obj, add_prefix, bind_frames, frame_count, vert_matches, max_rms_error,
+    max_keys, linear_interpolation):
     check_create_basis_shape_key(obj)
-    sk_x = obj.shape_key_add(name=SC_TEMP_SK_X)
-    sk_x.interpolation = 'KEY_LINEAR'
-    for v in sk_x.data:
-        v.co.x = v.co.x + 1.0
-
-    sk_y = obj.shape_key_add(name=SC_TEMP_SK_Y)
-    sk_y.interpolation = 'KEY_LINEAR'
-    for v in sk_y.data:
-        v.co.y = v.co.y + 1.0
-
-    sk_z = obj.shape_key_add(name=SC_TEMP_SK_Z)
-    sk_z.interpolation = 'KEY_LINEAR'
-    for v in sk_z.data:
-        v.co.z = v.co.z + 1.0
-
-    obj.show_only_shape_key = False
-
-    for frame in range(start_frame_num, end_frame_num+1):
-        # go to current frame
+    rest_cos = get_key_block_cos(obj.data.shape_keys.reference_key)
+    # only matched base vertexes have offsets from rest locations
+    base_indexes = np_unique(vert_matches[:, 0])
+    frames = []
+    frame_offsets = np_empty((frame_count, len(base_indexes), 3), dtype=np_float32)
+    for frame, sk_cos in bind_frames:
+        frame_offsets[len(frames)] = sk_cos[base_indexes] - rest_cos[base_indexes]
+        frames.append(frame)
+    if len(frames) == 0:
+        return None
+    basis_offsets, frame_weights, rms_error, max_error = get_pca_deform_basis(frame_offsets[:len(frames)],
+        max_rms_error, max_keys)
+    frame_offsets = None
+    for k in range(len(basis_offsets)):
+        sk_cos = rest_cos.copy()
+        sk_cos[base_indexes] += basis_offsets[k]
+        sk = create_deform_shape_key(obj, add_prefix + "PC" + str(k).zfill(3), sk_cos)
+        set_shape_key_slider_range(sk, -1.0, 1.0)
+        keyframe_shape_key_values(obj, sk.name, frames, frame_weights[:, k], linear_interpolation)
+    return "Compressed %i baked frames to %i shape keys, RMS error = %f, max vertex error = %f" % \
+        (len(frames), len(basis_offsets), rms_error, max_error)
+
+# yields (frame, shape_key_vertex_locations) for each frame in 'frames', with matched vertexes at their modified
+# (deformed) locations and other vertexes at Basis locations
+def simple_bind_frames(obj, frames, vert_matches):
+    check_create_basis_shape_key(obj)
+    rest_cos = get_key_block_cos(obj.data.shape_keys.reference_key)
+    mod_verts = None
+    for frame in frames:
         bpy.context.scene.frame_set(frame)
+        mod_verts = get_mod_verts(obj, mod_verts)
+        sk_cos = rest_cos.copy()
+        sk_cos[vert_matches[:, 0]] = mod_verts[vert_matches[:, 1]]
+        yield frame, sk_cos
+
+def add_axis_offset_shape_key(obj, name, axis):
+    sk = obj.shape_key_add(name=name)
+    sk.interpolation = 'KEY_LINEAR'
+    sk_cos = get_key_block_cos(sk)
+    sk_cos[:, axis] += 1.0
+    sk.data.foreach_set("co", sk_cos.reshape(-1))
+    return sk
 
-        # get target deformation points
-        deformed_cos = get_mod_verts(obj)
-
-        # temporarily mute visibility of the deform modifiers, except ARMATURE modifiers
-        muted_deform_mods = []
-        for mod in obj.modifiers:
-            if mod.type != 'ARMATURE' and is_deform_modifier(mod):
-                # save the visiblity states of the modifier
-                muted_deform_mods.append([mod, mod.show_viewport, mod.show_render])
-                # mute the deform modifier
-                mod.show_viewport = False
-                mod.show_render = False
-
-        # temporarily mute visibility of any active shape keys if the object has shape keys,
-        # and more then a 'Basis' key ...
-        muted_sk = []
-        if obj.data.shape_keys is not None and len(obj.data.shape_keys.key_blocks) > 1:
-            for sk in obj.data.shape_keys.key_blocks:
-                # if Shape Key is not the Basis key and it is not muted then mute it and remember to restore
-                if sk.name != 'Basis' and not sk.mute and sk.name not in (sk_x.name, sk_y.name, sk_z.name):
-                    muted_sk.append(sk)
-                    sk.mute = True
-
-        # get baseline vertice.co values after ARMATURE MODIFIERS, and before axis shape keys
-        basis_cos = get_mod_verts(obj)
-
-        # get x-offset vertice.co values
-        sk_x.value = 1.0
-        key_x_cos = get_mod_verts(obj)
-        sk_x.value = 0.0
-        # get y-offset vertice.co values
-        sk_y.value = 1.0
-        key_y_cos = get_mod_verts(obj)
-        sk_y.value = 0.0
-        # get z-offset vertice.co values
-        sk_z.value = 1.0
-        key_z_cos = get_mod_verts(obj)
-        sk_z.value = 0.0
-
-        deform_mats = [ np_array(
-            [np_subtract(key_x_cos[i], basis_cos[i]),
-            np_subtract(key_y_cos[i], basis_cos[i]),
-            np_subtract(key_z_cos[i], basis_cos[i])])
-            for i in range(len(basis_cos)) ]
-        # release references and free memory
+# add change of basis offsets, per matched vertex, to ShapeKey vertex locations 'sk_cos'
+def add_deform_offsets(sk_cos, vert_matches, match_deform_mats, target_cos, test_cos):
+    d_offsets = target_cos[vert_matches[:, 1]] - test_cos[vert_matches[:, 1]]
+    # apply change of basis matrix to deformed offsets, all matched vertexes at once
+    d_offsets = np_einsum('nij,nj->ni', match_deform_mats, d_offsets)
+    # use unbuffered add because more than one modified vertex may match the same base vertex
+    np_add.at(sk_cos, vert_matches[:, 0], d_offsets)
+
+# returns the ARMATURE modifier of 'obj' if its deformation can be computed from vertex group weights and pose bone
+# matrices (linear blend skinning), otherwise returns None.
+# Other deform modifiers are allowed, because they are muted while deform matrices are calculated
+def get_analytic_armature_modifier(obj):
+    arm_mods = [ mod for mod in obj.modifiers if mod.show_viewport and mod.type == 'ARMATURE' ]
+    if len(arm_mods) != 1:
+        return None
+    # modifiers that are not muted, and may change vertex count or order, are not allowed
+    if any(mod.show_viewport and mod.type != 'ARMATURE' and not is_deform_modifier(mod) for mod in obj.modifiers):
+        return None
+    arm_mod = arm_mods[0]
+    if arm_mod.object is None or arm_mod.object.type != 'ARMATURE' or not arm_mod.use_vertex_groups or \
+        arm_mod.use_bone_envelopes or arm_mod.use_deform_preserve_volume or arm_mod.use_multi_modifier or \
+        arm_mod.vertex_group != "":
+        return None
+    # B-Bone deformation is not linear per bone
+    if any(b.use_deform and b.bbone_segments > 1 for b in arm_mod.object.data.bones):
+        return None
+    return arm_mod
+
+# returns (bone_names, vert_indexes, bone_slots, weights), with one array entry per vertex group weight of a
+# deforming bone of 'arm_ob'
+def get_armature_skin_weights(obj, arm_ob):
+    bone_names = []
+    group_bone_slots = {}
+    for vg in obj.vertex_groups:
+        bone = arm_ob.data.bones.get(vg.name)
+        if bone is not None and bone.use_deform:
+            group_bone_slots[vg.index] = len(bone_names)
+            bone_names.append(vg.name)
+    vert_indexes = []
+    bone_slots = []
+    weights = []
+    for v in obj.data.vertices:
+        for g in v.groups:
+            slot = group_bone_slots.get(g.group)
+            if slot is not None and g.weight > 0.0:
+                vert_indexes.append(v.index)
+                bone_slots.append(slot)
+                weights.append(g.weight)
+    return bone_names, np_array(vert_indexes, dtype=np_int32), np_array(bone_slots, dtype=np_int32), \
+        np_array(weights, dtype=np_float64)
+
+# returns (deform_mats, deform_cos), where deform_mats is numpy array of per vertex deformation (Jacobian) matrices,
+# shape (vertex_count, 3, 3), and deform_cos is armature deformed 'rest_cos', shape (vertex_count, 3).
+# Same as ARMATURE modifier deform, with vertex groups, in current frame
+def get_armature_skin_deform(obj, arm_ob, skin_weights, rest_cos):
+    bone_names, vert_indexes, bone_slots, weights = skin_weights
+    # pose bone deform matrices, in object space of 'obj'
+    premat = arm_ob.matrix_world.inverted() @ obj.matrix_world
+    postmat = premat.inverted()
+    bone_mats = np_array([ postmat @ arm_ob.pose.bones[name].matrix @
+                           arm_ob.data.bones[name].matrix_local.inverted() @ premat for name in bone_names ],
+                         dtype=np_float64).reshape(-1, 4, 4)
+    vert_count = len(rest_cos)
+    weight_sums = np_zeros(vert_count, dtype=np_float64)
+    weighted_rots = np_zeros((vert_count, 3, 3), dtype=np_float64)
+    weighted_locs = np_zeros((vert_count, 3), dtype=np_float64)
+    np_add.at(weight_sums, vert_indexes, weights)
+    np_add.at(weighted_rots, vert_indexes, bone_mats[bone_slots, :3, :3] * weights[:, None, None])
+    np_add.at(weighted_locs, vert_indexes, bone_mats[bone_slots, :3, 3] * weights[:, None])
+    # vertexes with (nearly) zero total weight are not deformed, same as ARMATURE modifier
+    deform_mats = np_zeros((vert_count, 3, 3), dtype=np_float64)
+    deform_mats[:] = np_eye(3)
+    deform_cos = rest_cos.astype(np_float64)
+    skinned = weight_sums > 0.0001
+    deform_mats[skinned] = weighted_rots[skinned] / weight_sums[skinned, None, None]
+    deform_cos[skinned] = np_einsum('nij,nj->ni', deform_mats[skinned], deform_cos[skinned]) + \
+        weighted_locs[skinned] / weight_sums[skinned, None]
+    return deform_mats, deform_cos
+
+# yields (frame, shape_key_vertex_locations) for each frame in 'frames', with shape key offsets that respect
+# armature transformations, i.e. shape key offsets are applied before ARMATURE modifier
+def dynamic_bind_frames(obj, frames, vert_matches, extra_accuracy, use_analytic):
+    check_create_basis_shape_key(obj)
+    rest_cos = get_key_block_cos(obj.data.shape_keys.reference_key)
+    # if possible, get deform matrices from armature pose and vertex group weights instead of evaluating the mesh
+    # with axis offset shape keys
+    arm_mod = None
+    if use_analytic:
+        arm_mod = get_analytic_armature_modifier(obj)
+        if arm_mod is None:
+            print("dynamic_bind_frames(): Analytic deform not available for object " + obj.name +
+                ", deform matrices will be evaluated with axis offset shape keys")
+    # temporary shape keys, and muted modifiers / shape keys, are always restored, also if an error occurs or if
+    # generator is closed before all frames are yielded
+    temp_sks = []
+    muted_deform_mods = []
+    muted_sk = []
+    try:
+        if arm_mod is None:
+            # create a shape key for each axis, with offset of +1.0 along respective axis
+            sk_x = add_axis_offset_shape_key(obj, SC_TEMP_SK_X, 0)
+            temp_sks.append(sk_x)
+            sk_y = add_axis_offset_shape_key(obj, SC_TEMP_SK_Y, 1)
+            temp_sks.append(sk_y)
+            sk_z = add_axis_offset_shape_key(obj, SC_TEMP_SK_Z, 2)
+            temp_sks.append(sk_z)
+        else:
+            skin_weights = get_armature_skin_weights(obj, arm_mod.object)
+        # temporary shape key is used to test accuracy of shape key offsets
+        if extra_accuracy > 0:
+            sk_test = obj.shape_key_add(name=SC_TEMP_SK_BAKE, from_mix=False)
+            sk_test.interpolation = 'KEY_LINEAR'
+            temp_sks.append(sk_test)
+        temp_sk_names = [ sk.name for sk in temp_sks ]
+
+        obj.show_only_shape_key = False
+
+        # evaluated vertex location arrays are re-used every frame
+        deformed_cos = None
+        basis_cos = None
         key_x_cos = None
         key_y_cos = None
         key_z_cos = None
-
-        prefix = add_prefix
-        if append_frame_to_name:
-            prefix = prefix + str(frame).zfill(4)
-        sk_offsets = obj.shape_key_add(name=prefix)
-        sk_offsets.interpolation = 'KEY_LINEAR'
-        for base_v_index, mod_v_index in vert_matches:
-            skv = sk_offsets.data[base_v_index]
-            d_offset = np_subtract(deformed_cos[mod_v_index], basis_cos[mod_v_index])
-            # apply change of basis matrix to deformed offset
-            d_offset = deform_mats[mod_v_index].dot(d_offset)
-            skv.co.x = skv.co.x + d_offset[0]
-            skv.co.y = skv.co.y + d_offset[1]
-            skv.co.z = skv.co.z + d_offset[2]
-
-        for i in range(extra_accuracy):
-            sk_offsets.value = 1.0
-            key_test_cos = get_mod_verts(obj)
-            sk_offsets.value = 0.0
-            for base_v_index, mod_v_index in vert_matches:
-                skv = sk_offsets.data[base_v_index]
-                d_offset = np_subtract(deformed_cos[mod_v_index], key_test_cos[mod_v_index])
-                d_offset = deform_mats[mod_v_index].dot(d_offset)
-                skv.co.x = skv.co.x + d_offset[0]
-                skv.co.y = skv.co.y + d_offset[1]
-                skv.co.z = skv.co.z + d_offset[2]
-
-        if animate_keys:
-            # switch the shapekey for it's key_blocks counter-part, so that keyframes will insert correctly
-            sk_offsets = obj.data.shape_keys.key_blocks[sk_offsets.name]
-            # set values and insert keyframes
-            sk_offsets.value = 0
-            sk_offsets.keyframe_insert(data_path='value', frame=frame-1)
-            sk_offsets.keyframe_insert(data_path='value', frame=frame+1)
-            sk_offsets.value = 1
-            sk_offsets.keyframe_insert(data_path='value', frame=frame)
-
-        # restore the visibility muted shape keys
+        key_test_cos = None
+        for frame in frames:
+            # go to current frame
+            bpy.context.scene.frame_set(frame)
+
+            # get target deformation points
+            deformed_cos = get_mod_verts(obj, deformed_cos)
+
+            # temporarily mute visibility of the deform modifiers, except ARMATURE modifiers
+            for mod in obj.modifiers:
+                if mod.type != 'ARMATURE' and is_deform_modifier(mod):
+                    # save the visiblity states of the modifier
+                    muted_deform_mods.append([mod, mod.show_viewport, mod.show_render])
+                    # mute the deform modifier
+                    mod.show_viewport = False
+                    mod.show_render = False
+
+            # temporarily mute visibility of any active shape keys if the object has shape keys,
+            # and more then a 'Basis' key ...
+            if obj.data.shape_keys is not None and len(obj.data.shape_keys.key_blocks) > 1:
+                for sk in obj.data.shape_keys.key_blocks:
+                    # if Shape Key is not the Basis key and it is not muted then mute it and remember to restore
+                    if sk.name != 'Basis' and not sk.mute and sk.name not in temp_sk_names:
+                        muted_sk.append(sk)
+                        sk.mute = True
+
+            if arm_mod is None:
+                # get baseline vertice.co values after ARMATURE MODIFIERS, and before axis shape keys
+                basis_cos = get_mod_verts(obj, basis_cos)
+
+                # get x-offset vertice.co values
+                sk_x.value = 1.0
+                key_x_cos = get_mod_verts(obj, key_x_cos)
+                sk_x.value = 0.0
+                # get y-offset vertice.co values
+                sk_y.value = 1.0
+                key_y_cos = get_mod_verts(obj, key_y_cos)
+                sk_y.value = 0.0
+                # get z-offset vertice.co values
+                sk_z.value = 1.0
+                key_z_cos = get_mod_verts(obj, key_z_cos)
+                sk_z.value = 0.0
+
+                # change of basis matrix per matched vertex, with one row per axis shape key offset
+                match_deform_mats = np_stack((key_x_cos - basis_cos, key_y_cos - basis_cos, key_z_cos - basis_cos),
+                    axis=1)[vert_matches[:, 1]].astype(np_float64)
+            else:
+                # rows of change of basis matrix are columns of armature deform matrix
+                deform_mats, basis_cos = get_armature_skin_deform(obj, arm_mod.object, skin_weights, rest_cos)
+                match_deform_mats = deform_mats.transpose(0, 2, 1)[vert_matches[:, 1]]
+
+            sk_cos = rest_cos.astype(np_float64)
+            add_deform_offsets(sk_cos, vert_matches, match_deform_mats, deformed_cos, basis_cos)
+
+            for i in range(extra_accuracy):
+                sk_test.data.foreach_set("co", sk_cos.astype(np_float32).reshape(-1))
+                sk_test.value = 1.0
+                key_test_cos = get_mod_verts(obj, key_test_cos)
+                sk_test.value = 0.0
+                add_deform_offsets(sk_cos, vert_matches, match_deform_mats, deformed_cos, key_test_cos)
+
+            # restore the visibility muted shape keys
+            for sk in muted_sk:
+                sk.mute = False
+            muted_sk = []
+
+            # restore the visibility muted deform modifiers
+            for mod, show_v, show_r  in muted_deform_mods:
+                mod.show_viewport = show_v
+                mod.show_render = show_r
+            muted_deform_mods = []
+
+            yield frame, sk_cos.astype(np_float32)
+    finally:
         for sk in muted_sk:
             sk.mute = False
-
-        # restore the visibility muted deform modifiers
         for mod, show_v, show_r  in muted_deform_mods:
             mod.show_viewport = show_v
             mod.show_render = show_r
+        for sk in temp_sks:
+            obj.shape_key_remove(sk)
 
-    obj.shape_key_remove(sk_x)
-    obj.shape_key_remove(sk_y)
-    obj.shape_key_remove(sk_z)
-
-def bake_deform_shape_keys(context, obj, add_prefix, bind_frame_num, start_frame_num, end_frame_num, animate_keys,
-    append_frame_to_name, is_dynamic, extra_accuracy, mask_vgroup_name, mask_include):
-    old_current_frame = context.scene.frame_current
-
+# maximum number of frames in one adaptive segment, so that memory use of adaptive bake is bounded even if pose is
+# held for many frames
+ADAPTIVE_MAX_SEGMENT_FRAMES = 64
+
+# yields only the (frame, shape_key_vertex_locations) from 'bind_frames' that are needed so that linear
+# interpolation between yielded frames is within 'tolerance' distance of every skipped frame, for every vertex.
+# First and last frames are always yielded, and at least one frame is yielded per ADAPTIVE_MAX_SEGMENT_FRAMES frames
+def adaptive_bind_frames(bind_frames, tolerance):
+    seg_start = None
+    # frames after segment start that may be skipped, last frame is candidate for segment end
+    seg_frames = []
+    for frame, sk_cos in bind_frames:
+        if seg_start is None:
+            seg_start = (frame, sk_cos)
+            yield seg_start
+            continue
+        if len(seg_frames) >= ADAPTIVE_MAX_SEGMENT_FRAMES or \
+                not is_interpolated_within_tolerance(seg_start, (frame, sk_cos), seg_frames, tolerance):
+            # previous candidate frame is needed, and becomes start of next segment
+            seg_start = seg_frames[-1]
+            yield seg_start
+            seg_frames = []
+        seg_frames.append((frame, sk_cos))
+    if len(seg_frames) > 0:
+        yield seg_frames[-1]
+
+# returns True if linear interpolation between 'start' and 'end' (frame, vertex_locations) is within 'tolerance'
+# distance of every vertex location of every (frame, vertex_locations) in 'mid_frames'
+def is_interpolated_within_tolerance(start, end, mid_frames, tolerance):
+    start_frame, start_cos = start
+    end_frame, end_cos = end
+    delta_cos = end_cos - start_cos
+    for frame, sk_cos in mid_frames:
+        factor = (frame - start_frame) / (end_frame - start_frame)
+        if np_norm(start_cos + delta_cos * factor - sk_cos, axis=1).max() > tolerance:
+            return False
+    return True
+
+def bind_vert_matches(context, obj, bind_frame_num, base_vert_mask):
     # before binding, temporarily mute visibility of deform modifiers
     muted_deform_mods = []
     for mod in obj.modifiers:
@@ -465,8 +779,7 @@ def bake_deform_shape_keys(context, obj, add_prefix, bind_frame_num, start_frame
 
     # get "bind" vert matches, by location, in bind frame
     context.scene.frame_set(bind_frame_num)
-    vert_matches = get_vert_matches(obj, mask_vgroup_name, mask_include)
-    print("bake_deform_shape_keys(): Bind vertex count = " + str(len(vert_matches)))
+    vert_matches = get_vert_matches(obj, base_vert_mask)
 
     # after binding, restore visibility of muted shape keys
     for sk in muted_sk:
@@ -476,56 +789,315 @@ def bake_deform_shape_keys(context, obj, add_prefix, bind_frame_num, start_frame
     for mod, show_v, show_r  in muted_deform_mods:
         mod.show_viewport = show_v
         mod.show_render = show_r
+    return vert_matches
+
+def bake_deform_shape_keys(context, obj, add_prefix, bind_frame_num, start_frame_num, end_frame_num, animate_keys,
+    append_frame_to_name, is_dynamic, extra_accuracy, mask_vgroup_name, mask_include, use_bind_cache,
+    use_analytic, use_adaptive, adaptive_tolerance, use_compress, compress_max_error, compress_max_keys,
+    bake_target, cache_filepath, use_parallel, parallel_workers, use_incremental, use_isolate, use_dedup,
+    dedup_tolerance):
+    old_current_frame = context.scene.frame_current
+    isolated_obs = []
+    bind_frames = None
+    parallel_temp_dir = None
+    try:
+        # if isolating, then only 'obj' and objects it depends on (e.g. armature, hooks) are evaluated when frame
+        # changes
+        if use_isolate:
+            isolate_object_evaluation(context.scene, get_object_dependency_closure(context.scene, obj), isolated_obs)
+            print("bake_deform_shape_keys(): Isolated evaluation, disabled %i objects" % len(isolated_obs))
+        # get mask vertex group membership once, for binding and for bind cache key
+        base_vert_mask = get_bind_vert_mask(obj, mask_vgroup_name, mask_include)
+        vert_matches = None
+        if use_bind_cache:
+            bind_cache_key = get_bind_cache_key(obj, bind_frame_num, base_vert_mask)
+            vert_matches = get_cached_vert_matches(obj, bind_cache_key)
+            if vert_matches is not None:
+                print("bake_deform_shape_keys(): Using cached bind, vertex count = " + str(len(vert_matches)))
+        if vert_matches is None:
+            vert_matches = bind_vert_matches(context, obj, bind_frame_num, base_vert_mask)
+            print("bake_deform_shape_keys(): Bind vertex count = " + str(len(vert_matches)))
+            if use_bind_cache:
+                set_cached_vert_matches(obj, bind_cache_key, vert_matches)
+
+        # if incremental, then bake only frames with changed fingerprint, replacing shape keys of changed frames
+        frames = range(start_frame_num, end_frame_num+1)
+        fingerprints = None
+        # options that prevent incremental bake, reported after full bake
+        incremental_blockers = []
+        if use_incremental:
+            if use_adaptive:
+                incremental_blockers.append("Adaptive Frames")
+            if use_compress:
+                incremental_blockers.append("Compress")
+            if bake_target != SK_BAKE_TARGET_SHAPE_KEYS:
+                incremental_blockers.append("Cache File")
+            if not append_frame_to_name:
+                incremental_blockers.append("Add Frame to Name disabled")
+        if use_incremental and len(incremental_blockers) == 0:
+            frames, fingerprints = get_incremental_bake_frames(context, obj, add_prefix, frames,
+                get_bake_settings_key(obj, bind_frame_num, base_vert_mask, is_dynamic, extra_accuracy, use_analytic))
+            print("bake_deform_shape_keys(): Incremental bake of %i changed frames, out of %i frames" %
+                (len(frames), end_frame_num - start_frame_num + 1))
+            if len(frames) == 0:
+                return "No frames changed since previous bake"
+
+        if fingerprints is None and use_parallel and parallel_workers > 1 and end_frame_num > start_frame_num:
+            # frames are baked by headless Blender processes, using saved copy of current file
+            check_create_basis_shape_key(obj)
+            parallel_temp_dir, chunk_filepaths, err_msg = run_parallel_bake(obj, start_frame_num, end_frame_num,
+                vert_matches, is_dynamic, extra_accuracy, use_analytic, parallel_workers)
+            if err_msg is not None:
+                return err_msg
+            bind_frames = read_parallel_bake_frames(chunk_filepaths,
+                get_key_block_cos(obj.data.shape_keys.reference_key))
+        elif is_dynamic:
+            bind_frames = dynamic_bind_frames(obj, frames, vert_matches, extra_accuracy, use_analytic)
+        else:
+            bind_frames = simple_bind_frames(obj, frames, vert_matches)
+        if fingerprints is not None:
+            msg = bake_incremental_frames(obj, add_prefix, bind_frames, animate_keys, fingerprints)
+            # report options that are not used by incremental bake
+            skipped_options = []
+            if use_parallel and parallel_workers > 1:
+                skipped_options.append("Parallel")
+            if use_dedup:
+                skipped_options.append("Dedup")
+            if len(skipped_options) > 0:
+                msg += "\nIncremental bake skipped options: " + ", ".join(skipped_options)
+            return msg
+        msg = bake_bind_frames(context, obj, add_prefix, start_frame_num, end_frame_num, animate_keys,
+            append_frame_to_name, bind_frames, vert_matches, use_adaptive, adaptive_tolerance, use_compress,
+            compress_max_error, compress_max_keys, bake_target, cache_filepath, use_dedup, dedup_tolerance)
+        if len(incremental_blockers) > 0:
+            skip_msg = "Incremental not used, all frames baked, because of: " + ", ".join(incremental_blockers)
+            msg = skip_msg if msg is None else msg + "\n" + skip_msg
+        return msg
+    finally:
+        if bind_frames is not None:
+            bind_frames.close()
+        remove_parallel_bake_files(parallel_temp_dir)
+        restore_object_evaluation(isolated_obs)
+        context.scene.frame_set(old_current_frame)
+
+# create shape keys, or bake cache file, from 'bind_frames' generator of (frame, shape_key_vertex_locations)
+def bake_bind_frames(context, obj, add_prefix, start_frame_num, end_frame_num, animate_keys, append_frame_to_name,
+    bind_frames, vert_matches, use_adaptive, adaptive_tolerance, use_compress, compress_max_error, compress_max_keys,
+    bake_target, cache_filepath, use_dedup, dedup_tolerance):
+    # if adaptive, then skip frames that can be interpolated from other frames
+    if use_adaptive:
+        bind_frames = adaptive_bind_frames(bind_frames, adaptive_tolerance)
+
+    # if baking to cache file, then stream vertex offsets to file instead of creating shape keys
+    if bake_target == SK_BAKE_TARGET_CACHE_FILE:
+        check_create_basis_shape_key(obj)
+        rest_cos = get_key_block_cos(obj.data.shape_keys.reference_key)
+        err_msg = write_bake_cache(bpy.path.abspath(cache_filepath), bind_frames,
+            end_frame_num - start_frame_num + 1, rest_cos)
+        if err_msg is not None:
+            return err_msg
+        return "Baked deform offsets to cache file:\n" + \
+            get_bake_cache_filepaths(bpy.path.abspath(cache_filepath))[1]
+
+    # if compressing, then create basis shape keys with keyframed weights instead of one shape key per frame
+    if use_compress:
+        msg = create_compressed_deform_shape_keys(obj, add_prefix, bind_frames,
+            end_frame_num - start_frame_num + 1, vert_matches, compress_max_error, compress_max_keys, use_adaptive)
+        if use_dedup and msg is not None:
+            msg += "\nDedup not used, because Compress is enabled"
+        return msg
+
+    # create shape keys in the "deform" frames, if dedup then frames within tolerance of a previous frame re-use
+    # the previous frame's shape key
+    frame_keys = []
+    unique_keys = {}
+    unique_key_count = 0
+    for frame, sk_cos in bind_frames:
+        key_name = None
+        if use_dedup:
+            sk_cos = sk_cos.astype(np_float32)
+            key_sig = get_shape_key_signature(sk_cos, dedup_tolerance)
+            key_name = find_duplicate_shape_key(obj, unique_keys, key_sig, sk_cos, dedup_tolerance)
+        if key_name is None:
+            sk = create_deform_shape_key(obj, get_deform_key_name(add_prefix, frame, append_frame_to_name), sk_cos)
+            key_name = sk.name
+            if use_dedup:
+                unique_keys.setdefault(key_sig[0], []).append((key_name, key_sig))
+                unique_key_count += 1
+        frame_keys.append((frame, key_name))
+    if use_adaptive:
+        print("bake_deform_shape_keys(): Adaptive bake created %i shape keys for %i frames" %
+            (len(frame_keys), end_frame_num - start_frame_num + 1))
+    # if animating keys then add keyframes before and after each shape key frame with value = 0, and
+    # add keyframe on shape key frame with value = 1
+    if animate_keys and len(frame_keys) > 0:
+        keyframe_deform_shape_keys(obj, frame_keys, use_adaptive)
+    if use_dedup:
+        dup_count = len(frame_keys) - unique_key_count
+        return "Baked %i frames to %i unique shape keys, %i frames re-use shape keys, memory saved = %.2f MB" % \
+            (len(frame_keys), unique_key_count, dup_count, dup_count * len(obj.data.vertices) * 12 / 1048576)
+    return None
 
-    if is_dynamic:
-        dynamic_bind(obj, add_prefix, start_frame_num, end_frame_num, animate_keys, append_frame_to_name,
-            vert_matches, extra_accuracy)
+# returns small signature of shape key vertex locations 'sk_cos', so that full vertex locations of previously
+# baked shape keys do not need to be kept in memory: (bucket, centroid, norm), where bucket is centroid quantized to
+# cells of size 'tolerance' (or exact centroid if tolerance is zero)
+def get_shape_key_signature(sk_cos, tolerance):
+    centroid = sk_cos.mean(axis=0, dtype=np_float64)
+    if tolerance > 0.0:
+        bucket = tuple(np_floor(centroid / tolerance).astype(np_int64).tolist())
+    else:
+        bucket = tuple(centroid.tolist())
+    return bucket, centroid, float(np_norm(sk_cos))
+
+# returns name of shape key of 'obj' in 'unique_keys' dict of {bucket: [(key_name, signature), ...]} with all
+# vertexes within 'tolerance' distance of 'sk_cos', or None if no match is found
+def find_duplicate_shape_key(obj, unique_keys, key_sig, sk_cos, tolerance):
+    bucket, centroid, sk_cos_norm = key_sig
+    # max vertex distance >= distance between centroids, so matching keys are in same or neighboring buckets
+    if tolerance > 0.0:
+        near_buckets = [ tuple(b + o for b, o in zip(bucket, offset))
+                         for offset in itertools.product((-1, 0, 1), repeat=3) ]
     else:
-        simple_bind(obj, add_prefix, start_frame_num, end_frame_num, animate_keys, append_frame_to_name,
-            vert_matches)
-
-    context.scene.frame_set(old_current_frame)
-
-# include_original is True to enable copying modified vertex coords to original vertex coords AND ShapeKey coords
-# (if ShapeKey(s) exist)
-def copy_eval_bmesh_to_verts(context, from_ob, to_mesh, include_original):
-    # get 'from_ob' vertice locations, with modifiers applied (local space)
-    depsgraph = context.evaluated_depsgraph_get()
-    bm = bmesh.new()
-    bm.from_object(from_ob, depsgraph)
-    bm.verts.ensure_lookup_table()
-    # check if ShapeKeys are used, and select vertex data output
-    active_sk_index = from_ob.active_shape_key_index
-    vert_data = None
-    if to_mesh.shape_keys != None and active_sk_index < len(to_mesh.shape_keys.key_blocks):
-        vert_data = to_mesh.shape_keys.key_blocks[active_sk_index].data
-    # use Mesh vertices if ShapeKey data output is not available
-    if vert_data is None:
-        vert_data = to_mesh.vertices
-        iterations = 1
-    elif include_original:
-        iterations = 2
+        near_buckets = [ bucket ]
+    # max vertex distance >= difference of Frobenius norms / sqrt(vertex count), so keys with large difference of
+    # norms are skipped without comparing vertexes
+    norm_tolerance = tolerance * math.sqrt(len(sk_cos))
+    for near_bucket in near_buckets:
+        for key_name, (_, key_centroid, key_cos_norm) in unique_keys.get(near_bucket, []):
+            if abs(key_cos_norm - sk_cos_norm) > norm_tolerance or \
+                    np_norm(key_centroid - centroid) > tolerance:
+                continue
+            # compare all vertexes only for signature matches, reading vertexes from shape key
+            key_cos = get_key_block_cos(obj.data.shape_keys.key_blocks[key_name])
+            if np_norm(key_cos - sk_cos, axis=1).max() <= tolerance:
+                return key_name
+    return None
+
+# returns hash string of bake settings that all baked frames depend on, see get_bind_cache_key()
+def get_bake_settings_key(obj, bind_frame_num, base_vert_mask, is_dynamic, extra_accuracy, use_analytic):
+    h = hashlib.sha1()
+    h.update(get_bind_cache_key(obj, bind_frame_num, base_vert_mask).encode())
+    h.update(str((is_dynamic, extra_accuracy, use_analytic)).encode())
+    return h.hexdigest()
+
+# returns hash string of everything that deformation of 'obj' in current frame depends on: modifier settings (may
+# be animated), values of driven properties of 'obj', and evaluated matrices of all 'dependency_objects' (from
+# get_object_dependency_closure(), e.g. 'obj', parents, armature, hook, shrinkwrap target, constraint targets,
+# driver targets), including evaluated pose bone matrices of armature objects
+def get_bake_frame_fingerprint(obj, dependency_objects, depsgraph):
+    h = hashlib.sha1()
+    h.update(get_modifier_stack_signature(obj).encode())
+    for anim_id in [ obj, obj.data, obj.data.shape_keys ]:
+        h.update(get_driven_values_signature(anim_id, depsgraph).encode())
+    for dep_ob in sorted(dependency_objects, key=lambda ob: ob.name_full):
+        dep_ob_eval = dep_ob.evaluated_get(depsgraph)
+        h.update(dep_ob.name_full.encode())
+        h.update(np_array(dep_ob_eval.matrix_world, dtype=np_float32).tobytes())
+        if dep_ob_eval.type == 'ARMATURE' and dep_ob_eval.pose is not None:
+            bone_mats = np_empty(len(dep_ob_eval.pose.bones) * 16, dtype=np_float32)
+            dep_ob_eval.pose.bones.foreach_get("matrix", bone_mats)
+            h.update(bone_mats.tobytes())
+    return h.hexdigest()
+
+# returns string of evaluated values of all properties of 'anim_id' that are driven by drivers
+def get_driven_values_signature(anim_id, depsgraph):
+    if anim_id is None or anim_id.animation_data is None:
+        return ""
+    id_eval = anim_id.evaluated_get(depsgraph)
+    values = []
+    for fc in anim_id.animation_data.drivers:
+        try:
+            value = id_eval.path_resolve(fc.data_path)
+        except ValueError:
+            continue
+        if hasattr(value, "__len__") and not isinstance(value, str):
+            value = value[fc.array_index] if fc.array_index < len(value) else None
+        values.append("%s[%i]=%s" % (fc.data_path, fc.array_index, value))
+    return ";".join(values)
+
+# returns (changed_frames, fingerprints), where 'changed_frames' is list of frames with fingerprint different from
+# fingerprint stored by previous bake (or frames without shape key), and 'fingerprints' is dict of
+# {key_name: fingerprint} with bake settings key and fingerprint of every frame
+def get_incremental_bake_frames(context, obj, add_prefix, frames, bake_settings_key):
+    key_blocks = obj.data.shape_keys.key_blocks if obj.data.shape_keys is not None else {}
+    # fingerprints from previous bake are discarded if bake settings changed
+    fingerprints = {}
+    if obj.get(SC_BAKE_SETTINGS_KEY) == bake_settings_key and obj.get(SC_BAKE_FINGERPRINTS) is not None:
+        fingerprints = obj[SC_BAKE_FINGERPRINTS].to_dict()
+    changed_frames = []
+    dependency_objects = get_object_dependency_closure(context.scene, obj)
+    for frame in frames:
+        context.scene.frame_set(frame)
+        key_name = get_deform_key_name(add_prefix, frame, True)
+        fingerprint = get_bake_frame_fingerprint(obj, dependency_objects, context.evaluated_depsgraph_get())
+        if key_blocks.get(key_name) is None or fingerprints.get(key_name) != fingerprint:
+            changed_frames.append(frame)
+            fingerprints[key_name] = fingerprint
+    fingerprints[SC_BAKE_SETTINGS_KEY] = bake_settings_key
+    return changed_frames, fingerprints
+
+# replace vertex locations of existing shape keys (names and keyframes are kept), or create new shape keys, for
+# changed frames of incremental bake, then store fingerprints on 'obj'
+def bake_incremental_frames(obj, add_prefix, bind_frames, animate_keys, fingerprints):
+    replace_count = 0
+    for frame, sk_cos in bind_frames:
+        key_name = get_deform_key_name(add_prefix, frame, True)
+        sk = obj.data.shape_keys.key_blocks.get(key_name) if obj.data.shape_keys is not None else None
+        if sk is None:
+            sk = create_deform_shape_key(obj, key_name, sk_cos)
+            if animate_keys:
+                keyframe_deform_shape_keys(obj, [(frame, sk.name)], False)
+        else:
+            sk.data.foreach_set("co", sk_cos.astype(np_float32).reshape(-1))
+            replace_count += 1
+    obj[SC_BAKE_SETTINGS_KEY] = fingerprints.pop(SC_BAKE_SETTINGS_KEY)
+    obj[SC_BAKE_FINGERPRINTS] = fingerprints
+    obj.data.update()
+    return "Incremental bake replaced %i shape keys" % replace_count
+
+# load frames from 'start_frame_num' to 'end_frame_num' (inclusive) of bake cache file, as shape keys or as
+# FLOAT_VECTOR attributes (vertex locations) on 'obj'
+def load_bake_cache(obj, cache_filepath, add_prefix, start_frame_num, end_frame_num, load_type, animate_keys,
+    append_frame_to_name):
+    cache_filepath = bpy.path.abspath(cache_filepath)
+    header, err_msg = read_bake_cache_header(cache_filepath)
+    if err_msg is not None:
+        return err_msg
+    if header["vertex_count"] != len(obj.data.vertices):
+        return "Bake cache vertex count does not match object vertex count, (cache, object) = (%i, %i)" % \
+            (header["vertex_count"], len(obj.data.vertices))
+    if load_type == SK_CACHE_LOAD_ATTRIBUTES:
+        rest_cos = get_mesh_vert_cos(obj.data)
     else:
-        iterations = 1
-    while iterations > 0:
-        if include_original and iterations == 2:
-            iter_vert_data = to_mesh.vertices
+        check_create_basis_shape_key(obj)
+        rest_cos = get_key_block_cos(obj.data.shape_keys.reference_key)
+    frame_keys = []
+    for frame, offsets in read_bake_cache_frames(cache_filepath, header, start_frame_num, end_frame_num):
+        name = get_deform_key_name(add_prefix, frame, append_frame_to_name)
+        if load_type == SK_CACHE_LOAD_ATTRIBUTES:
+            attr = obj.data.attributes.new(name, "FLOAT_VECTOR", "POINT")
+            attr.data.foreach_set("vector", (rest_cos + offsets).reshape(-1))
         else:
-            iter_vert_data = vert_data
-        # copy locations of bmesh vertices to output
-        bm_vert_len = len(bm.verts)
-        vert_data_len = len(iter_vert_data)
-        for i, v in enumerate(bm.verts):
-            # exit loop if index out of range for original vertices
-            if i >= vert_data_len:
-                break
-            iter_vert_data[i].co = v.co
-        if i >= vert_data_len:
-            bm.free()
-            return "Modified mesh vertex count greater than original mesh vertex count, (modified, original) = " \
-                "(%i, %i)" % (bm_vert_len, vert_data_len)
-        iterations -= 1
-    bm.free()
+            sk = create_deform_shape_key(obj, name, rest_cos + offsets)
+            frame_keys.append((frame, sk.name))
+    if animate_keys and len(frame_keys) > 0:
+        # frames in cache may be skipped by adaptive bake, so use linear interpolation if frames are not contiguous
+        keyframe_deform_shape_keys(obj, frame_keys, len(frame_keys) < frame_keys[-1][0] - frame_keys[0][0] + 1)
+    obj.data.update()
+    return None
+
+# copy evaluated (modified) vertex locations 'eval_cos' to 'vert_data' (mesh vertices or shape key data), in bulk.
+# Returns None if no error occurred, or string with error message
+def copy_eval_cos_to_vert_data(eval_cos, vert_data):
+    vert_data_len = len(vert_data)
+    copy_len = min(len(eval_cos), vert_data_len)
+    data_cos = np_empty((vert_data_len, 3), dtype=np_float32)
+    vert_data.foreach_get("co", data_cos.reshape(-1))
+    data_cos[:copy_len] = eval_cos[:copy_len]
+    vert_data.foreach_set("co", data_cos.reshape(-1))
+    if len(eval_cos) > vert_data_len:
+        return "Modified mesh vertex count greater than original mesh vertex count, (modified, original) = " \
+            "(%i, %i)" % (len(eval_cos), vert_data_len)
     return None
 
 def apply_modifier_sk(context, src_ob):
@@ -538,47 +1110,35 @@ def apply_modifier_sk(context, src_ob):
         src_mesh_settings["active_shape_key_index"] = src_ob.active_shape_key_index
         src_mesh_settings["add_rest_position_attribute"] = src_ob.add_rest_position_attribute
         src_mesh_settings["show_only_shape_key"] = src_ob.show_only_shape_key
-    # save selected state of all Objects
-    sel_ob_names = [ ob.name for ob in bpy.data.objects if ob.select_get() ]
-    for ob in bpy.data.objects:
-        ob.select_set(False)
-    # get old names list, duplicate object, and check new object names against old to get new object
-    old_ob_names = [ ob.name for ob in bpy.data.objects ]
-    src_ob.select_set(True)
-    bpy.ops.object.duplicate(linked=False)
-    temp_ob = [ ob for ob in bpy.data.objects if ob.name not in old_ob_names ][0]
-    # remove all animation data from duplicate Mesh, so ShapeKey properties can be modified easily (Drivers on
-    # some properties could cause problems)
-    temp_mesh = temp_ob.data
-    if temp_mesh.shape_keys != None:
-        temp_mesh.shape_keys.animation_data_clear()
-    # set ShapeKey to Basis, if any
+    # show only active ShapeKey, so each ShapeKey can be evaluated with modifiers, without other ShapeKeys
     if src_mesh.shape_keys != None:
         src_mesh.shape_keys.use_relative = False
-        temp_mesh.shape_keys.use_relative = False
-        temp_ob.active_shape_key_index = 0
-        temp_ob.add_rest_position_attribute = False
-        temp_ob.show_only_shape_key = True
         src_ob.active_shape_key_index = 0
         src_ob.add_rest_position_attribute = False
         src_ob.show_only_shape_key = True
+    # evaluate each ShapeKey once, and write to ShapeKey in bulk. Basis and original vertex locations are written
+    # last, because modifiers may use original vertex locations
+    ret_msg = None
+    eval_cos = None
+    basis_cos = None
+    key_count = 1 if src_mesh.shape_keys is None else len(src_mesh.shape_keys.key_blocks)
+    for index in range(key_count):
+        if src_mesh.shape_keys != None:
+            src_ob.active_shape_key_index = index
+        eval_cos = get_mod_verts(src_ob, eval_cos)
+        if index == 0:
+            basis_cos = eval_cos.copy()
+            continue
+        msg = copy_eval_cos_to_vert_data(eval_cos, src_mesh.shape_keys.key_blocks[index].data)
+        if msg != None:
+            ret_msg = msg
     # copy Basis
-    ret_msg = copy_eval_bmesh_to_verts(context, temp_ob, src_mesh, True)
-    # copy other ShapeKeys, if any
-    if src_ob.data.shape_keys != None:
-        for index in range(len(src_ob.data.shape_keys.key_blocks) - 1):
-            temp_ob.active_shape_key_index = index + 1
-            src_ob.active_shape_key_index = index + 1
-            msg = copy_eval_bmesh_to_verts(context, temp_ob, src_mesh, False)
-            if msg != None:
-                ret_msg = msg
-    # delete temp Object
-    bpy.data.objects.remove(temp_ob)
-    # restore selected state of all Objects
-    for ob_name in sel_ob_names:
-        ob = bpy.data.objects.get(ob_name)
-        if ob != None:
-            ob.select_set(True)
+    msg = copy_eval_cos_to_vert_data(basis_cos, src_mesh.vertices)
+    if msg != None:
+        ret_msg = msg
+    if src_mesh.shape_keys != None:
+        copy_eval_cos_to_vert_data(basis_cos, src_mesh.shape_keys.key_blocks[0].data)
+    src_mesh.update()
     # restore state of original Object properties
     if src_mesh.shape_keys != None:
         if src_mesh_settings.get("shape_keys.use_relative") == True:
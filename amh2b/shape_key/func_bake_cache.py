@@ -0,0 +1,84 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import json
+import os
+import traceback
+
+from numpy import float32 as np_float32
+from numpy import load as np_load
+from numpy.lib.format import open_memmap
+
+# number of frames written to cache file between flushes to disk
+BAKE_CACHE_FLUSH_FRAMES = 32
+
+# returns (header_filepath, data_filepath) for bake cache 'filepath', with or without file extension
+def get_bake_cache_filepaths(filepath):
+    base_path = os.path.splitext(filepath)[0]
+    return base_path + ".json", base_path + ".npy"
+
+# stream per frame vertex offsets (shape key vertex locations minus 'rest_cos') from 'bind_frames' to a memory
+# mapped .npy file, with a .json header file. Memory use does not depend on number of frames.
+# Returns None if no error occurred, or string with error message
+def write_bake_cache(filepath, bind_frames, frame_count, rest_cos):
+    header_filepath, data_filepath = get_bake_cache_filepaths(filepath)
+    try:
+        offsets_map = open_memmap(data_filepath, mode='w+', dtype=np_float32, shape=(frame_count, len(rest_cos), 3))
+        frames = []
+        for frame, sk_cos in bind_frames:
+            offsets_map[len(frames)] = sk_cos - rest_cos
+            frames.append(frame)
+            if len(frames) % BAKE_CACHE_FLUSH_FRAMES == 0:
+                offsets_map.flush()
+        offsets_map.flush()
+        offsets_map = None
+        header = {
+            "data_file": os.path.basename(data_filepath),
+            "vertex_count": len(rest_cos),
+            "frame_start": frames[0] if len(frames) > 0 else None,
+            "frame_end": frames[-1] if len(frames) > 0 else None,
+            # row of data file for each baked frame, frames may be skipped by adaptive bake
+            "frames": frames,
+        }
+        with open(header_filepath, "w") as header_file:
+            json.dump(header, header_file, indent=1)
+    except:
+        return traceback.format_exc()
+    return None
+
+# returns (header_dict, None) if header is read, or (None, error_message_string) if error occurred
+def read_bake_cache_header(filepath):
+    header_filepath, _ = get_bake_cache_filepaths(filepath)
+    try:
+        with open(header_filepath, "r") as header_file:
+            header = json.load(header_file)
+    except:
+        return None, "Unable to read bake cache header from file:\n" + header_filepath
+    if not isinstance(header, dict) or not isinstance(header.get("frames"), list) or \
+        not isinstance(header.get("vertex_count"), int):
+        return None, "Invalid bake cache header in file:\n" + header_filepath
+    return header, None
+
+# yields (frame, vertex_offsets) for each cached frame in range 'start_frame_num' to 'end_frame_num', inclusive.
+# Cache data is memory mapped, so only the requested frames are read from disk
+def read_bake_cache_frames(filepath, header, start_frame_num, end_frame_num):
+    data_filepath = os.path.join(os.path.dirname(filepath), header.get("data_file", ""))
+    offsets_map = np_load(data_filepath, mmap_mode='r')
+    for row, frame in enumerate(header["frames"]):
+        if start_frame_num <= frame <= end_frame_num:
+            yield frame, offsets_map[row]
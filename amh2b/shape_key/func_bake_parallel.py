@@ -0,0 +1,99 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from numpy import save as np_save
+
+import bpy
+
+from .func_bake_cache import read_bake_cache_frames, read_bake_cache_header
+
+BAKE_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "bake_worker.py")
+# number of lines of worker log included in error message, if worker fails
+BAKE_WORKER_LOG_LINES = 20
+
+# returns list of (start_frame_num, end_frame_num) tuples, splitting frame range into at most 'chunk_count' chunks
+def get_frame_chunks(start_frame_num, end_frame_num, chunk_count):
+    frame_count = end_frame_num - start_frame_num + 1
+    chunk_count = max(1, min(chunk_count, frame_count))
+    chunks = []
+    chunk_start = start_frame_num
+    for i in range(chunk_count):
+        chunk_len = frame_count // chunk_count + (1 if i < frame_count % chunk_count else 0)
+        chunks.append((chunk_start, chunk_start + chunk_len - 1))
+        chunk_start += chunk_len
+    return chunks
+
+def get_worker_log_tail(log_filepath):
+    try:
+        with open(log_filepath, "r") as log_file:
+            return "".join(log_file.readlines()[-BAKE_WORKER_LOG_LINES:])
+    except:
+        return ""
+
+# save copy of current blend file and bind map to temporary directory, then run headless Blender worker processes
+# to bake frame range in chunks. Each worker writes its chunk to a bake cache file.
+# Returns (temp_dir, chunk_cache_filepaths, None) if no error occurred, or (None, None, error_message_string)
+def run_parallel_bake(obj, start_frame_num, end_frame_num, vert_matches, is_dynamic, extra_accuracy,
+    use_analytic, worker_count):
+    temp_dir = tempfile.mkdtemp(prefix="amh2b_bake_")
+    blend_filepath = os.path.join(temp_dir, "bake.blend")
+    bind_filepath = os.path.join(temp_dir, "bind.npy")
+    bpy.ops.wm.save_as_mainfile(filepath=blend_filepath, check_existing=False, copy=True)
+    np_save(bind_filepath, vert_matches)
+    # start one worker process per chunk, all chunks run at the same time
+    workers = []
+    for chunk_start, chunk_end in get_frame_chunks(start_frame_num, end_frame_num, worker_count):
+        cache_filepath = os.path.join(temp_dir, "chunk_%i.json" % chunk_start)
+        log_filepath = os.path.join(temp_dir, "chunk_%i.log" % chunk_start)
+        with open(log_filepath, "w") as log_file:
+            proc = subprocess.Popen([bpy.app.binary_path, "--background", "--factory-startup", blend_filepath,
+                "--python-exit-code", "1", "--python", BAKE_WORKER_SCRIPT, "--", obj.name, str(chunk_start),
+                str(chunk_end), bind_filepath, str(int(is_dynamic)), str(extra_accuracy), str(int(use_analytic)),
+                cache_filepath],
+                stdout=log_file, stderr=subprocess.STDOUT)
+        workers.append((proc, cache_filepath, log_filepath))
+    err_msg = None
+    for proc, cache_filepath, log_filepath in workers:
+        if proc.wait() != 0 and err_msg is None:
+            err_msg = "Parallel bake worker failed, log:\n" + get_worker_log_tail(log_filepath)
+    if err_msg is not None:
+        remove_parallel_bake_files(temp_dir)
+        return None, None, err_msg
+    print("run_parallel_bake(): Baked %i frames with %i worker processes" %
+        (end_frame_num - start_frame_num + 1, len(workers)))
+    return temp_dir, [ cache_filepath for _, cache_filepath, _ in workers ], None
+
+# yields (frame, shape_key_vertex_locations) for each frame baked by parallel workers, in frame order
+def read_parallel_bake_frames(chunk_cache_filepaths, rest_cos):
+    for cache_filepath in chunk_cache_filepaths:
+        header, err_msg = read_bake_cache_header(cache_filepath)
+        if err_msg is not None:
+            print("read_parallel_bake_frames(): " + err_msg)
+            continue
+        for frame, offsets in read_bake_cache_frames(cache_filepath, header, header["frame_start"],
+            header["frame_end"]):
+            yield frame, rest_cos + offsets
+
+def remove_parallel_bake_files(temp_dir):
+    if temp_dir is not None:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,90 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from numpy import abs as np_abs
+from numpy import cumsum as np_cumsum
+from numpy import empty as np_empty
+from numpy import float64 as np_float64
+from numpy import maximum as np_maximum
+from numpy import sqrt as np_sqrt
+from numpy import zeros as np_zeros
+from numpy.linalg import eigh as np_eigh
+from numpy.linalg import norm as np_norm
+
+# relative size of smallest eigenvalue used, compared to largest eigenvalue
+PCA_MIN_EIGEN_RATIO = 1e-12
+# number of frames per block when calculating reconstruction error
+PCA_ERROR_BLOCK_FRAMES = 64
+# maximum number of values in one block of offsets converted to float64, when calculating Gram matrix and basis
+# shapes, so that offsets of all frames are never copied at once
+PCA_BLOCK_VALUES = 1 << 23
+
+# returns (basis_offsets, frame_weights, rms_error, max_error) from truncated SVD of per frame vertex offsets:
+#   'frame_offsets' is numpy array of per frame vertex offsets, shape (frame_count, vertex_count, 3)
+#   'basis_offsets' is numpy array of basis shape offsets, shape (basis_count, vertex_count, 3)
+#   'frame_weights' is numpy array of per frame basis shape weights, shape (frame_count, basis_count),
+#   scaled so that all weights are in range [-1, 1]
+# The smallest number of basis shapes is used that gives RMS vertex error less than or equal to 'max_rms_error',
+# up to 'max_basis_count' basis shapes. Errors are vertex distances between frame_offsets and reconstruction
+def get_pca_deform_basis(frame_offsets, max_rms_error, max_basis_count):
+    frame_count, vert_count, _ = frame_offsets.shape
+    # offsets are not copied, and are converted to float64 in blocks of columns (vertex coordinates)
+    offsets = frame_offsets.reshape(frame_count, -1)
+    column_count = offsets.shape[1]
+    block_columns = max(1, PCA_BLOCK_VALUES // frame_count)
+    # eigen decomposition of the (frame_count x frame_count) Gram matrix is much smaller than SVD of offsets,
+    # because frame_count is usually much smaller than vertex_count
+    gram = np_zeros((frame_count, frame_count), dtype=np_float64)
+    for j in range(0, column_count, block_columns):
+        block = offsets[:, j:j+block_columns].astype(np_float64)
+        gram += block @ block.T
+    eig_vals, eig_vecs = np_eigh(gram)
+    eig_vals = np_maximum(eig_vals[::-1], 0.0)
+    eig_vecs = eig_vecs[:, ::-1]
+    # sum of remaining eigenvalues is the squared error of reconstruction with first 'k' basis shapes
+    usable_count = int((eig_vals > eig_vals[0] * PCA_MIN_EIGEN_RATIO).sum()) if eig_vals[0] > 0.0 else 0
+    basis_count = min(max_basis_count, max(usable_count, 1))
+    remain_sq_errors = eig_vals.sum() - np_cumsum(eig_vals)
+    for k in range(1, basis_count+1):
+        if np_sqrt(max(remain_sq_errors[k-1], 0.0) / (frame_count * vert_count)) <= max_rms_error:
+            basis_count = k
+            break
+    # frame weights (U * S) and basis shapes (V^T), from eigen vectors of Gram matrix
+    sing_vals = np_sqrt(eig_vals[:basis_count])
+    sing_vals[sing_vals == 0.0] = 1.0
+    frame_weights = eig_vecs[:, :basis_count] * sing_vals
+    basis_offsets = np_empty((basis_count, column_count), dtype=np_float64)
+    for j in range(0, column_count, block_columns):
+        basis_offsets[:, j:j+block_columns] = eig_vecs[:, :basis_count].T @ \
+            offsets[:, j:j+block_columns].astype(np_float64)
+    basis_offsets /= sing_vals[:, None]
+    # scale basis shapes so that frame weights are in range [-1, 1]
+    weight_scales = np_abs(frame_weights).max(axis=0)
+    weight_scales[weight_scales == 0.0] = 1.0
+    frame_weights /= weight_scales
+    basis_offsets *= weight_scales[:, None]
+    # calculate actual reconstruction errors, in blocks of frames to limit memory use
+    sum_sq_error = 0.0
+    max_error = 0.0
+    for i in range(0, frame_count, PCA_ERROR_BLOCK_FRAMES):
+        block_errors = np_norm((offsets[i:i+PCA_ERROR_BLOCK_FRAMES] -
+            frame_weights[i:i+PCA_ERROR_BLOCK_FRAMES] @ basis_offsets).reshape(-1, 3), axis=1)
+        sum_sq_error += (block_errors ** 2).sum()
+        max_error = max(max_error, block_errors.max())
+    rms_error = float(np_sqrt(sum_sq_error / (frame_count * vert_count)))
+    return basis_offsets.reshape(basis_count, vert_count, 3), frame_weights, rms_error, float(max_error)
@@ -0,0 +1,155 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import json
+import re
+import traceback
+
+from numpy import any as np_any
+from numpy import array as np_array
+from numpy import flatnonzero as np_flatnonzero
+from numpy import int32 as np_int32
+from numpy import load as np_load
+from numpy import savez_compressed as np_savez_compressed
+
+from ..object_func import check_create_basis_shape_key, get_mesh_vert_cos
+from ..template import get_searchable_object_name
+from .func import get_key_block_cos, is_name_prefix_match, set_shape_key_slider_range
+
+# ShapeKey library file format (.npz):
+#   "meta" - JSON string with {searchable_object_name: {"vertex_count": int, "keys": [key_settings_dict, ...]}}
+#   "o<object_index>_k<key_index>_idx" - int32 indexes of vertexes with non-zero offset
+#   "o<object_index>_k<key_index>_delta" - float32 offsets of those vertexes, from mesh vertex locations
+SK_LIBRARY_META = "meta"
+
+def get_library_array_name(ob_index, key_index, suffix):
+    return "o%i_k%i_%s" % (ob_index, key_index, suffix)
+
+# export ShapeKeys by name prefix, of all MESH objects in 'objects', to ShapeKey library file. Objects are stored
+# by searchable name (MHX prefix removed), so ShapeKeys can be imported to objects from other MHX imports.
+# Returns (exported_key_count, None) if no error occurred, or (0, error_message_string)
+def export_shape_key_library(filepath, objects, copy_prefix):
+    meta = {}
+    arrays = {}
+    for ob in objects:
+        lib_ob_name = get_searchable_object_name(ob.name)
+        if ob.type != 'MESH' or ob.data.shape_keys is None or lib_ob_name in meta:
+            continue
+        vert_cos = get_mesh_vert_cos(ob.data)
+        ob_index = len(meta)
+        keys_meta = []
+        for sk in ob.data.shape_keys.key_blocks:
+            if sk == ob.data.shape_keys.reference_key or not is_name_prefix_match(sk.name, copy_prefix):
+                continue
+            deltas = get_key_block_cos(sk) - vert_cos
+            # store only vertexes with non-zero offset
+            indexes = np_flatnonzero(np_any(deltas != 0.0, axis=1)).astype(np_int32)
+            arrays[get_library_array_name(ob_index, len(keys_meta), "idx")] = indexes
+            arrays[get_library_array_name(ob_index, len(keys_meta), "delta")] = deltas[indexes]
+            keys_meta.append({
+                "name": sk.name,
+                "slider_min": sk.slider_min,
+                "slider_max": sk.slider_max,
+                "value": sk.value,
+                "interpolation": sk.interpolation,
+                "vertex_group": sk.vertex_group,
+                "relative_key": sk.relative_key.name,
+                "mute": sk.mute,
+            })
+        if len(keys_meta) > 0:
+            meta[lib_ob_name] = { "vertex_count": len(vert_cos), "keys": keys_meta }
+    if len(meta) == 0:
+        return 0, "No shape keys to export"
+    arrays[SK_LIBRARY_META] = np_array(json.dumps(meta))
+    try:
+        with open(filepath, "wb") as library_file:
+            np_savez_compressed(library_file, **arrays)
+    except:
+        return 0, traceback.format_exc()
+    return sum([ len(ob_meta["keys"]) for ob_meta in meta.values() ]), None
+
+# returns name of object in library 'meta' to use for object named 'ob_name', or None if not found. Names are
+# matched exactly, then by searchable name (MHX prefix removed), then optionally with auto-name extension removed
+def get_library_object_name(meta, ob_name, swap_autoname_ext):
+    search_name = get_searchable_object_name(ob_name)
+    for name in (ob_name, search_name):
+        if name in meta:
+            return name
+    if swap_autoname_ext and re.match(".*\.[0-9]{3}", search_name) and search_name[:-4] in meta:
+        return search_name[:-4]
+    return None
+
+# import ShapeKeys from ShapeKey library file to MESH objects in 'objects', matched by object name. Existing
+# ShapeKeys with same name are replaced. Returns (imported_key_count, None) if no error occurred, or
+# (0, error_message_string)
+def import_shape_key_library(filepath, objects, swap_autoname_ext):
+    err_msg = "Unable to read shape key library from file:\n" + filepath
+    try:
+        library = np_load(filepath, allow_pickle=False)
+    except:
+        return 0, err_msg
+    # library must be .npz file, not .npy file
+    if not hasattr(library, "files"):
+        return 0, err_msg
+    # close library file after import, so file is not locked
+    with library:
+        try:
+            meta = json.loads(str(library[SK_LIBRARY_META]))
+        except:
+            return 0, err_msg
+        return import_shape_key_library_objects(library, meta, objects, swap_autoname_ext), None
+
+# returns number of shape keys imported from open 'library' file to 'objects'
+def import_shape_key_library_objects(library, meta, objects, swap_autoname_ext):
+    ob_names = list(meta.keys())
+    import_count = 0
+    for ob in objects:
+        if ob.type != 'MESH':
+            continue
+        lib_ob_name = get_library_object_name(meta, ob.name, swap_autoname_ext)
+        if lib_ob_name is None:
+            continue
+        ob_meta = meta[lib_ob_name]
+        if ob_meta["vertex_count"] != len(ob.data.vertices):
+            print("import_shape_key_library(): Cannot import shapekeys to object (" + ob.name + "), library " \
+                  "vertex count (" + str(ob_meta["vertex_count"]) + ") doesn't equal object vertex count (" +
+                  str(len(ob.data.vertices)) + ").")
+            continue
+        check_create_basis_shape_key(ob)
+        key_blocks = ob.data.shape_keys.key_blocks
+        vert_cos = get_mesh_vert_cos(ob.data)
+        ob_index = ob_names.index(lib_ob_name)
+        for key_index, key_meta in enumerate(ob_meta["keys"]):
+            sk = key_blocks.get(key_meta["name"])
+            if sk is None:
+                sk = ob.shape_key_add(name=key_meta["name"], from_mix=False)
+            sk_cos = vert_cos.copy()
+            indexes = library[get_library_array_name(ob_index, key_index, "idx")]
+            sk_cos[indexes] += library[get_library_array_name(ob_index, key_index, "delta")]
+            sk.data.foreach_set("co", sk_cos.reshape(-1))
+            set_shape_key_slider_range(sk, key_meta["slider_min"], key_meta["slider_max"])
+            sk.value = key_meta["value"]
+            sk.interpolation = key_meta["interpolation"]
+            sk.vertex_group = key_meta["vertex_group"]
+            sk.mute = key_meta["mute"]
+            import_count += 1
+        # set relative keys after all keys are imported, because relative key may be one of the imported keys
+        for key_meta in ob_meta["keys"]:
+            key_blocks[key_meta["name"]].relative_key = key_blocks.get(key_meta["relative_key"], key_blocks[0])
+        ob.data.update()
+    return import_count
@@ -0,0 +1,70 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from mathutils.bvhtree import BVHTree
+from numpy import einsum as np_einsum
+from numpy import empty as np_empty
+from numpy import float32 as np_float32
+from numpy import float64 as np_float64
+from numpy import int32 as np_int32
+from numpy import stack as np_stack
+from numpy import where as np_where
+
+# returns numpy array of mesh triangle vertex indexes, with shape (triangle_count, 3)
+def get_mesh_tri_verts(mesh):
+    mesh.calc_loop_triangles()
+    tri_verts = np_empty(len(mesh.loop_triangles) * 3, dtype=np_int32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+    return tri_verts.reshape(-1, 3)
+
+# returns (tri_verts, bary_weights), binding each 'dest_cos' vertex to nearest point on source surface given by
+# 'src_cos' and 'src_tri_verts'. 'tri_verts' has shape (dest_vertex_count, 3) with source vertex indexes of nearest
+# triangle, and 'bary_weights' has shape (dest_vertex_count, 3) with barycentric weights of nearest point.
+# 'dest_cos' must be in source object space
+def get_surface_binding(src_cos, src_tri_verts, dest_cos):
+    bvh = BVHTree.FromPolygons(src_cos.tolist(), src_tri_verts.tolist())
+    nearest_tris = np_empty(len(dest_cos), dtype=np_int32)
+    nearest_cos = np_empty((len(dest_cos), 3), dtype=np_float64)
+    for i, co in enumerate(dest_cos.tolist()):
+        location, _, tri_index, _ = bvh.find_nearest(co)
+        nearest_tris[i] = tri_index
+        nearest_cos[i] = location
+    tri_verts = src_tri_verts[nearest_tris]
+    # barycentric weights of nearest points, in one vectorized pass
+    a = src_cos[tri_verts[:, 0]].astype(np_float64)
+    v0 = src_cos[tri_verts[:, 1]] - a
+    v1 = src_cos[tri_verts[:, 2]] - a
+    v2 = nearest_cos - a
+    d00 = np_einsum("ij,ij->i", v0, v0)
+    d01 = np_einsum("ij,ij->i", v0, v1)
+    d11 = np_einsum("ij,ij->i", v1, v1)
+    d20 = np_einsum("ij,ij->i", v2, v0)
+    d21 = np_einsum("ij,ij->i", v2, v1)
+    denom = d00 * d11 - d01 * d01
+    # degenerate triangles bind to first vertex
+    degenerate = denom == 0.0
+    denom[degenerate] = 1.0
+    w1 = np_where(degenerate, 0.0, (d11 * d20 - d01 * d21) / denom)
+    w2 = np_where(degenerate, 0.0, (d00 * d21 - d01 * d20) / denom)
+    bary_weights = np_stack((1.0 - w1 - w2, w1, w2), axis=1).astype(np_float32)
+    return tri_verts, bary_weights
+
+# returns destination vertex offsets, with shape (dest_vertex_count, 3), interpolated from source vertex offsets
+# 'src_deltas' by surface binding
+def get_surface_bind_deltas(src_deltas, tri_verts, bary_weights):
+    return np_einsum("ijk,ij->ik", src_deltas[tri_verts], bary_weights)
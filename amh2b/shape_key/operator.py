@@ -16,11 +16,15 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from bpy_extras.io_utils import ImportHelper
+import os
+
+from bpy_extras.io_utils import ExportHelper, ImportHelper
 from bpy.props import StringProperty
 from bpy.types import Operator
 
-from .func import (sk_func_delete, copy_shape_keys, search_file_for_auto_sk, bake_deform_shape_keys, apply_modifier_sk)
+from .func import (SK_BAKE_TARGET_CACHE_FILE, sk_func_delete, copy_shape_keys, search_file_for_auto_sk,
+    bake_deform_shape_keys, apply_modifier_sk, load_bake_cache, clear_surface_bind_cache)
+from .func_library import export_shape_key_library, import_shape_key_library
 
 class AMH2B_OT_SKFuncDelete(Operator):
     """With selected MESH type objects, delete shape keys by prefix"""
@@ -55,7 +59,22 @@ class AMH2B_OT_CopyOtherSK(Operator):
             self.report({'ERROR'}, "No meshes were selected to receive copied shape keys")
             return {'CANCELLED'}
 
-        copy_shape_keys(context, ob_act, other_obj_list, copy_prefix, context.scene.amh2b.sk_adapt_size)
+        result = copy_shape_keys(context, ob_act, other_obj_list, copy_prefix, context.scene.amh2b.sk_adapt_size,
+                                 context.scene.amh2b.sk_surface_bind)
+        if result is not None:
+            self.report({'ERROR'}, result)
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+class AMH2B_OT_ClearSurfaceBindCache(Operator):
+    """With selected objects, remove cached Surface Bind binding, to free memory used by binding"""
+    bl_idname = "amh2b.sk_clear_surface_bind_cache"
+    bl_label = "Clear Bind Cache"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        count = clear_surface_bind_cache(context.selected_objects)
+        self.report({'INFO'}, "Cleared Surface Bind cache from " + str(count) + " object(s)")
         return {'FINISHED'}
 
 class AMH2B_OT_SearchFileForAutoShapeKeys(Operator, ImportHelper):
@@ -72,6 +91,46 @@ class AMH2B_OT_SearchFileForAutoShapeKeys(Operator, ImportHelper):
             scn.amh2b.sk_adapt_size, scn.amh2b.sk_swap_autoname_ext)
         return {'FINISHED'}
 
+class AMH2B_OT_ExportShapeKeyLibrary(Operator, ExportHelper):
+    """For each selected MESH object: Export shape keys by Prefix to shape key library file (.npz), with only """ \
+        """non-zero vertex offsets stored"""
+    bl_idname = "amh2b.sk_export_library"
+    bl_label = "Export Library"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".npz"
+    filter_glob: StringProperty(default="*.npz", options={'HIDDEN'})
+
+    def execute(self, context):
+        export_count, err_msg = export_shape_key_library(self.filepath, context.selected_objects,
+            context.scene.amh2b.sk_function_prefix)
+        if err_msg != None:
+            self.report({'ERROR'}, err_msg)
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Exported %i shape keys to library file" % export_count)
+        return {'FINISHED'}
+
+class AMH2B_OT_ImportShapeKeyLibrary(Operator, ImportHelper):
+    """For each selected MESH object: Import shape keys from shape key library file (.npz), by object name. """ \
+        """Existing shape keys with same name are replaced"""
+    bl_idname = "amh2b.sk_import_library"
+    bl_label = "Import Library"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter_glob: StringProperty(default="*.npz", options={'HIDDEN'})
+
+    def execute(self, context):
+        if not os.path.isfile(self.filepath):
+            self.report({'ERROR'}, "Unable to import shape key library, invalid filepath")
+            return {'CANCELLED'}
+        import_count, err_msg = import_shape_key_library(self.filepath, context.selected_objects,
+            context.scene.amh2b.sk_swap_autoname_ext)
+        if err_msg != None:
+            self.report({'ERROR'}, err_msg)
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Imported %i shape keys from library file" % import_count)
+        return {'FINISHED'}
+
 class AMH2B_OT_BakeDeformShapeKeys(Operator):
     """Bake active object's mesh deformations to shape keys"""
     bl_idname = "amh2b.sk_bake_deform_shape_keys"
@@ -91,11 +150,52 @@ class AMH2B_OT_BakeDeformShapeKeys(Operator):
         if scn.amh2b.sk_start_frame > scn.amh2b.sk_end_frame:
             self.report({'ERROR'}, "Start Frame number is higher than End Frame number")
             return {'CANCELLED'}
+        if scn.amh2b.sk_bake_target == SK_BAKE_TARGET_CACHE_FILE and scn.amh2b.sk_bake_cache_filepath == '':
+            self.report({'ERROR'}, "Bake cache file path is blank")
+            return {'CANCELLED'}
 
-        bake_deform_shape_keys(context, act_ob, scn.amh2b.sk_deform_name_prefix, scn.amh2b.sk_bind_frame,
+        msg = bake_deform_shape_keys(context, act_ob, scn.amh2b.sk_deform_name_prefix, scn.amh2b.sk_bind_frame,
             scn.amh2b.sk_start_frame, scn.amh2b.sk_end_frame, scn.amh2b.sk_animate,
             scn.amh2b.sk_add_frame_to_name, scn.amh2b.sk_dynamic, scn.amh2b.sk_extra_accuracy,
-            scn.amh2b.sk_mask_vgroup_name, scn.amh2b.sk_mask_invert)
+            scn.amh2b.sk_mask_vgroup_name, scn.amh2b.sk_mask_invert, scn.amh2b.sk_bind_cache,
+            scn.amh2b.sk_dynamic_analytic, scn.amh2b.sk_adaptive, scn.amh2b.sk_adaptive_tolerance,
+            scn.amh2b.sk_compress, scn.amh2b.sk_compress_max_error, scn.amh2b.sk_compress_max_keys,
+            scn.amh2b.sk_bake_target, scn.amh2b.sk_bake_cache_filepath, scn.amh2b.sk_parallel,
+            scn.amh2b.sk_parallel_workers, scn.amh2b.sk_incremental,
+            scn.amh2b.sk_isolate, scn.amh2b.sk_dedup, scn.amh2b.sk_dedup_tolerance)
+        if msg != None:
+            self.report({'INFO'}, msg)
+        return {'FINISHED'}
+
+class AMH2B_OT_LoadBakeCache(Operator, ImportHelper):
+    """Load frames from Bake Deform cache file to active object, as shape keys or as attributes. Only frames """ \
+        """from Load Start to Load End are read from file"""
+    bl_idname = "amh2b.sk_load_bake_cache"
+    bl_label = "Load Cache"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: StringProperty(subtype='FILE_PATH', options={'HIDDEN'})
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        act_ob = context.active_object
+        if act_ob is None or act_ob.type != 'MESH':
+            self.report({'ERROR'}, "Active object is not MESH type")
+            return {'CANCELLED'}
+        if not os.path.isfile(self.filepath):
+            self.report({'ERROR'}, "Unable to load bake cache, invalid filepath")
+            return {'CANCELLED'}
+        scn = context.scene
+        if scn.amh2b.sk_cache_load_start > scn.amh2b.sk_cache_load_end:
+            self.report({'ERROR'}, "Load Start frame number is higher than Load End frame number")
+            return {'CANCELLED'}
+
+        msg = load_bake_cache(act_ob, self.filepath, scn.amh2b.sk_deform_name_prefix,
+            scn.amh2b.sk_cache_load_start, scn.amh2b.sk_cache_load_end, scn.amh2b.sk_cache_load_type,
+            scn.amh2b.sk_animate, scn.amh2b.sk_add_frame_to_name)
+        if msg != None:
+            self.report({'ERROR'}, msg)
+            return {'CANCELLED'}
         return {'FINISHED'}
 
 class AMH2B_OT_ApplyModifierSK(Operator):
@@ -17,8 +17,9 @@
 # ##### END GPL LICENSE BLOCK #####
 
 from .operator import (AMH2B_OT_SearchFileForAutoShapeKeys, AMH2B_OT_ApplyModifierSK, AMH2B_OT_BakeDeformShapeKeys,
-    AMH2B_OT_CopyOtherSK, AMH2B_OT_SKFuncDelete)
-from .func import (SK_FUNC_APPLY_MOD, SK_FUNC_BAKE, SK_FUNC_COPY, SK_FUNC_DELETE)
+    AMH2B_OT_CopyOtherSK, AMH2B_OT_ExportShapeKeyLibrary, AMH2B_OT_ImportShapeKeyLibrary, AMH2B_OT_LoadBakeCache,
+    AMH2B_OT_SKFuncDelete, AMH2B_OT_ClearSurfaceBindCache)
+from .func import (SK_BAKE_TARGET_CACHE_FILE, SK_FUNC_APPLY_MOD, SK_FUNC_BAKE, SK_FUNC_COPY, SK_FUNC_DELETE)
 
 def draw_panel_shape_key(self, context, func_grp_box):
     layout = self.layout
@@ -38,19 +39,59 @@ def draw_panel_shape_key(self, context, func_grp_box):
         row.prop(scn.amh2b, "sk_mask_invert", icon="ARROW_LEFTRIGHT", text="")
         layout.prop(scn.amh2b, "sk_deform_name_prefix")
         layout.prop(scn.amh2b, "sk_bind_frame")
+        layout.prop(scn.amh2b, "sk_bind_cache")
+        layout.prop(scn.amh2b, "sk_isolate")
         layout.prop(scn.amh2b, "sk_start_frame")
         layout.prop(scn.amh2b, "sk_end_frame")
         layout.prop(scn.amh2b, "sk_animate")
         layout.prop(scn.amh2b, "sk_add_frame_to_name")
+        layout.prop(scn.amh2b, "sk_incremental")
+        row = layout.row()
+        row.prop(scn.amh2b, "sk_adaptive")
+        sub = row.column()
+        sub.active = scn.amh2b.sk_adaptive
+        sub.prop(scn.amh2b, "sk_adaptive_tolerance", text="")
+        layout.prop(scn.amh2b, "sk_bake_target", text="")
+        if scn.amh2b.sk_bake_target == SK_BAKE_TARGET_CACHE_FILE:
+            layout.prop(scn.amh2b, "sk_bake_cache_filepath", text="")
+        else:
+            row = layout.row()
+            row.enabled = not scn.amh2b.sk_compress
+            row.prop(scn.amh2b, "sk_dedup")
+            sub = row.column()
+            sub.active = scn.amh2b.sk_dedup
+            sub.prop(scn.amh2b, "sk_dedup_tolerance", text="")
+            layout.prop(scn.amh2b, "sk_compress")
+            sub = layout.column()
+            sub.active = scn.amh2b.sk_compress
+            sub.prop(scn.amh2b, "sk_compress_max_error")
+            sub.prop(scn.amh2b, "sk_compress_max_keys")
         layout.prop(scn.amh2b, "sk_dynamic")
         sub = layout.column()
         sub.active = scn.amh2b.sk_dynamic
+        sub.prop(scn.amh2b, "sk_dynamic_analytic")
         sub.label(text="Extra Accuracy")
         sub.prop(scn.amh2b, "sk_extra_accuracy")
+        row = layout.row()
+        row.prop(scn.amh2b, "sk_parallel")
+        sub = row.column()
+        sub.active = scn.amh2b.sk_parallel
+        sub.prop(scn.amh2b, "sk_parallel_workers", text="")
+        layout.separator()
+        layout.operator(AMH2B_OT_LoadBakeCache.bl_idname)
+        layout.prop(scn.amh2b, "sk_cache_load_type", text="")
+        layout.prop(scn.amh2b, "sk_cache_load_start")
+        layout.prop(scn.amh2b, "sk_cache_load_end")
     elif scn.amh2b.sk_active_function == SK_FUNC_COPY:
         layout.operator(AMH2B_OT_SearchFileForAutoShapeKeys.bl_idname)
         layout.operator(AMH2B_OT_CopyOtherSK.bl_idname)
+        row = layout.row(align=True)
+        row.operator(AMH2B_OT_ExportShapeKeyLibrary.bl_idname)
+        row.operator(AMH2B_OT_ImportShapeKeyLibrary.bl_idname)
         layout.prop(scn.amh2b, "sk_adapt_size")
+        row = layout.row(align=True)
+        row.prop(scn.amh2b, "sk_surface_bind")
+        row.operator(AMH2B_OT_ClearSurfaceBindCache.bl_idname)
         layout.prop(scn.amh2b, "sk_swap_autoname_ext")
         layout.prop(scn.amh2b, "sk_function_prefix")
     elif scn.amh2b.sk_active_function == SK_FUNC_DELETE:
@@ -16,16 +16,14 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-import re
 import bpy
 from bpy_extras.io_utils import ImportHelper
 
-from .append_from_file_func import append_object_from_blend_file
-from .object_func import delete_all_objects_except
-from .template import get_searchable_object_name
-from .vgroup_func import (copy_vgroups_by_name_prefix, delete_vgroups_by_name_prefix)
+from .append_from_file_func import append_auto_search_objects, remove_appended_data
+from .vgroup_func import (cleanup_vgroups_by_name_prefix, copy_vgroups_by_name_prefix,
+    delete_vgroups_by_name_prefix)
 
-def copy_vertex_groups_by_prefix(from_mesh_obj, sel_obj_list, vg_name_prefix, create_name_only):
+def copy_vertex_groups_by_prefix(from_mesh_obj, sel_obj_list, vg_name_prefix, create_name_only, weight_precision):
     old_3dview_mode = bpy.context.object.mode
     bpy.ops.object.mode_set(mode='OBJECT')
 
@@ -39,7 +37,7 @@ def copy_vertex_groups_by_prefix(from_mesh_obj, sel_obj_list, vg_name_prefix, cr
                 ") to dest ("+to_mesh_obj.name+"), source vertex count ("+str(svc)+
                 ") doesn't equal destination vertex count ("+str(dvc)+").")
             continue
-        copy_vgroups_by_name_prefix(from_mesh_obj, to_mesh_obj, vg_name_prefix, create_name_only)
+        copy_vgroups_by_name_prefix(from_mesh_obj, to_mesh_obj, vg_name_prefix, create_name_only, weight_precision)
 
     bpy.ops.object.mode_set(mode=old_3dview_mode)
 
@@ -59,7 +57,8 @@ class AMH2B_OT_CopyVertexGroupsByPrefix(bpy.types.Operator):
             return {'CANCELLED'}
 
         scn = context.scene
-        copy_vertex_groups_by_prefix(act_ob, context.selected_objects, scn.amh2b.vg_func_name_prefix, scn.amh2b.vg_create_name_only)
+        copy_vertex_groups_by_prefix(act_ob, context.selected_objects, scn.amh2b.vg_func_name_prefix,
+            scn.amh2b.vg_create_name_only, scn.amh2b.vg_weight_precision)
         return {'FINISHED'}
 
 def delete_prefixed_vertex_groups(selection_list, delete_prefix):
@@ -87,8 +86,37 @@ class AMH2B_OT_DeleteVertexGroupsByPrefix(bpy.types.Operator):
         delete_prefixed_vertex_groups(context.selected_objects, scn.amh2b.vg_func_name_prefix)
         return {'FINISHED'}
 
+def cleanup_prefixed_vertex_groups(selection_list, name_prefix, normalize, limit_total, clean, clean_epsilon,
+                                   weight_precision):
+    old_3dview_mode = bpy.context.object.mode
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    # iterate over selected 'MESH' type objects
+    changed_count = 0
+    for mesh_obj in (x for x in selection_list if x.type == 'MESH'):
+        changed_count += cleanup_vgroups_by_name_prefix(mesh_obj, name_prefix, normalize, limit_total, clean,
+                                                        clean_epsilon, weight_precision)
+
+    bpy.ops.object.mode_set(mode=old_3dview_mode)
+    return changed_count
+
+class AMH2B_OT_CleanupVertexGroupsByPrefix(bpy.types.Operator):
+    """With all selected objects, clean / limit total / normalize weights of unlocked vertex groups by prefix. """ \
+        """Blank prefix includes all unlocked vertex groups"""
+    bl_idname = "amh2b.vg_cleanup_by_prefix"
+    bl_label = "Cleanup Groups"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scn = context.scene
+        changed_count = cleanup_prefixed_vertex_groups(context.selected_objects, scn.amh2b.vg_func_name_prefix,
+            scn.amh2b.vg_normalize, scn.amh2b.vg_limit_total, scn.amh2b.vg_clean, scn.amh2b.vg_clean_epsilon,
+            scn.amh2b.vg_weight_precision)
+        self.report({'INFO'}, "Changed weights of %i vertex group(s)" % changed_count)
+        return {'FINISHED'}
+
 def search_file_for_auto_vgroups(sel_obj_list, chosen_blend_file, name_prefix, swap_autoname_ext,
-                                    create_name_only):
+                                    create_name_only, weight_precision):
     old_3dview_mode = bpy.context.object.mode
     bpy.ops.object.mode_set(mode='OBJECT')
 
@@ -97,51 +125,25 @@ def search_file_for_auto_vgroups(sel_obj_list, chosen_blend_file, name_prefix, s
     for ob in sel_obj_list:
         if ob.type == 'MESH':
             other_obj_list.append(ob)
-    bpy.ops.object.select_all(action='DESELECT')
-
-    # keep a list of all objects in the Blend file, before objects are appended
-    all_objects_list_before = [ ob for ob in bpy.data.objects ]
 
+    # open file once, and append all needed VGroups mesh objects
+    src_objects, appended_ids = append_auto_search_objects(chosen_blend_file, other_obj_list, swap_autoname_ext)
     for sel in other_obj_list:
-        search_name = get_searchable_object_name(sel.name)
-        # if the desired VGroups mesh object name is already used then rename it before appending from file,
-        # and rename later after the appended object is deleted
-        test_obj = bpy.data.objects.get(search_name)
-        if test_obj is not None:
-            test_obj.name = "TempRenameName"
-
-        # if cannot load mesh object from file...
-        append_object_from_blend_file(chosen_blend_file, search_name)
-        appended_obj = bpy.data.objects.get(search_name)
+        appended_obj = src_objects.get(sel)
         if appended_obj is None:
-            # if "swap autoname ext" is enabled then check object name, and if it follows the
-            # '.001', '.002', etc. format, then try to swap again but with '.XYZ' extension removed
-            if swap_autoname_ext and re.match(".*\.[0-9]{3}", search_name):
-                no_ext_search_name = search_name[0:len(search_name)-4]
-                append_object_from_blend_file(chosen_blend_file, no_ext_search_name)
-                appended_obj = bpy.data.objects.get(no_ext_search_name)
-            else:
-                # if rename occurred, then undo rename
-                if test_obj is not None:
-                    test_obj.name = search_name
-                continue
-
+            continue
         # skip destination mesh objects with different numbers of vertices, unless create name only
         dvc = len(sel.data.vertices)
         svc = len(appended_obj.data.vertices)
         if dvc == svc or create_name_only == False:
-            copy_vgroups_by_name_prefix(appended_obj, sel, name_prefix, create_name_only)
+            copy_vgroups_by_name_prefix(appended_obj, sel, name_prefix, create_name_only, weight_precision)
         else:
             print("search_file_for_auto_vgroups(): Cannot copy vertex groups from source ("+appended_obj.name+
                 ") to dest ("+sel.name+"), source vertex count ("+str(svc)+
                 ") doesn't equal destination vertex count ("+str(dvc)+").")
 
-        # appended object may have pulled in other objects as dependencies, so delete all appended objects
-        delete_all_objects_except(all_objects_list_before)
-
-        # if an object was named in order to do appending then fix name
-        if test_obj is not None:
-            test_obj.name = search_name
+    # appended objects may have pulled in other data as dependencies, so delete all appended data
+    remove_appended_data(appended_ids)
 
     bpy.ops.object.mode_set(mode=old_3dview_mode)
 
@@ -156,5 +158,6 @@ class AMH2B_OT_SearchFileForAutoVGroups(bpy.types.Operator, ImportHelper):
     def execute(self, context):
         scn = context.scene
         search_file_for_auto_vgroups(context.selected_objects, self.filepath,
-            scn.amh2b.vg_func_name_prefix, scn.amh2b.vg_swap_autoname_ext, scn.amh2b.vg_create_name_only)
+            scn.amh2b.vg_func_name_prefix, scn.amh2b.vg_swap_autoname_ext, scn.amh2b.vg_create_name_only,
+            scn.amh2b.vg_weight_precision)
         return {'FINISHED'}
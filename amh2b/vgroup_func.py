@@ -18,9 +18,69 @@
 
 import re
 
+from numpy import arange as np_arange
+from numpy import argsort as np_argsort
+from numpy import array as np_array
+from numpy import bincount as np_bincount
+from numpy import cumsum as np_cumsum
+from numpy import float32 as np_float32
+from numpy import concatenate as np_concatenate
+from numpy import int32 as np_int32
+from numpy import lexsort as np_lexsort
+from numpy import ones as np_ones
+from numpy import repeat as np_repeat
+from numpy import rint as np_rint
+from numpy import split as np_split
+from numpy import unique as np_unique
+from numpy import zeros as np_zeros
+
 def get_vert_group_indexes(mesh_obj, vert_group_index):
     return [ v.index for v in mesh_obj.data.vertices if vert_group_index in [ vg.group for vg in v.groups ] ]
 
+# returns (row_starts, vert_indexes, weights), a compressed sparse row (CSR) matrix of all vertex group weights of
+# 'mesh_obj', read in one pass over vertexes. Row is vertex group index, see get_weight_matrix_row()
+def get_vgroup_weight_matrix(mesh_obj):
+    group_indexes = []
+    vert_indexes = []
+    weights = []
+    for v in mesh_obj.data.vertices:
+        for g in v.groups:
+            group_indexes.append(g.group)
+            vert_indexes.append(v.index)
+            weights.append(g.weight)
+    group_indexes = np_array(group_indexes, dtype=np_int32)
+    row_count = len(mesh_obj.vertex_groups)
+    if len(group_indexes) > 0:
+        row_count = max(row_count, int(group_indexes.max()) + 1)
+    # sort by vertex group index, keeping vertex order within each vertex group
+    order = np_argsort(group_indexes, kind='stable')
+    row_starts = np_zeros(row_count + 1, dtype=np_int32)
+    row_starts[1:] = np_cumsum(np_bincount(group_indexes, minlength=row_count))
+    return row_starts, np_array(vert_indexes, dtype=np_int32)[order], np_array(weights, dtype=np_float32)[order]
+
+# returns (vert_indexes, weights) of vertex group given by 'vert_group_index', from weight matrix
+def get_weight_matrix_row(weight_matrix, vert_group_index):
+    row_starts, vert_indexes, weights = weight_matrix
+    if vert_group_index + 1 >= len(row_starts):
+        return vert_indexes[:0], weights[:0]
+    start = row_starts[vert_group_index]
+    end = row_starts[vert_group_index + 1]
+    return vert_indexes[start:end], weights[start:end]
+
+# add vertexes to vertex group with weights, with one add() call per unique weight. If 'weight_precision' is
+# greater than zero, then weights are rounded to nearest multiple of 'weight_precision' (e.g. 0.001), so fewer
+# add() calls are needed
+def add_vertex_group_weights(vert_grp, vert_indexes, weights, weight_precision=0.0):
+    if len(vert_indexes) == 0:
+        return
+    if weight_precision > 0.0:
+        weights = (np_rint(weights / weight_precision) * weight_precision).clip(0.0, 1.0)
+    unique_weights, weight_buckets = np_unique(weights, return_inverse=True)
+    bucket_vert_indexes = np_split(vert_indexes[np_argsort(weight_buckets, kind='stable')],
+                                   np_cumsum(np_bincount(weight_buckets))[:-1])
+    for weight, bucket in zip(unique_weights.tolist(), bucket_vert_indexes):
+        vert_grp.add(bucket.tolist(), weight, 'REPLACE')
+
 def add_vertex_group(mesh_obj, grp_name, vert_indexes):
     # create new vertex group
     new_vert_grp = mesh_obj.vertex_groups.new(name=grp_name)
@@ -28,12 +88,13 @@ def add_vertex_group(mesh_obj, grp_name, vert_indexes):
     new_vert_grp.add(vert_indexes, 1.0, 'REPLACE')
     return new_vert_grp
 
-def add_vertex_group_weighted(mesh_obj, grp_name, vert_index_weights):
+# 'vert_indexes' and 'weights' are numpy arrays, e.g. from get_weight_matrix_row()
+def add_vertex_group_weighted(mesh_obj, grp_name, vert_indexes, weights, weight_precision=0.0):
     # create new vertex group
     new_vert_grp = mesh_obj.vertex_groups.new(name=grp_name)
     # transfer vertex group, with weights
-    for viw in vert_index_weights:
-        new_vert_grp.add([viw[0]], viw[1], 'REPLACE')
+    add_vertex_group_weights(new_vert_grp, vert_indexes, weights, weight_precision)
+    return new_vert_grp
 
 def copy_vertex_group(from_mesh_obj, to_mesh_obj, vert_grp_name):
     from_vert_grp = from_mesh_obj.vertex_groups.get(vert_grp_name)
@@ -44,18 +105,17 @@ def copy_vertex_group(from_mesh_obj, to_mesh_obj, vert_grp_name):
     # create new vertex group
     add_vertex_group(to_mesh_obj, from_vert_grp.name, vi_list)
 
-def copy_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name):
+# 'weight_matrix' is optional, from get_vgroup_weight_matrix(from_mesh_obj), so it can be re-used for many groups
+def copy_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name, weight_matrix=None, weight_precision=0.0):
     from_vert_grp = from_mesh_obj.vertex_groups.get(vert_grp_name)
     if from_vert_grp is None:
         return
-    # get vertex indexes in group given by from_vert_grp.index
-    vi_list = get_vert_group_indexes(from_mesh_obj, from_vert_grp.index)
-    # create list with weights
-    viw_list = []
-    for vi in vi_list:
-        viw_list.append([vi, from_vert_grp.weight(vi)])
+    if weight_matrix is None:
+        weight_matrix = get_vgroup_weight_matrix(from_mesh_obj)
+    # get vertex indexes and weights in group given by from_vert_grp.index
+    vert_indexes, weights = get_weight_matrix_row(weight_matrix, from_vert_grp.index)
     # create new vertex group
-    add_vertex_group_weighted(to_mesh_obj, from_vert_grp.name, viw_list)
+    add_vertex_group_weighted(to_mesh_obj, from_vert_grp.name, vert_indexes, weights, weight_precision)
 
 def copy_replace_vertex_group(from_mesh_obj, to_mesh_obj, vert_grp_name):
     from_vert_grp = from_mesh_obj.vertex_groups.get(vert_grp_name)
@@ -64,24 +124,29 @@ def copy_replace_vertex_group(from_mesh_obj, to_mesh_obj, vert_grp_name):
     delete_vertex_group(to_mesh_obj, vert_grp_name)
     copy_vertex_group(from_mesh_obj, to_mesh_obj, vert_grp_name)
 
-def copy_replace_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name):
+def copy_replace_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name, weight_matrix=None,
+                                       weight_precision=0.0):
     from_vert_grp = from_mesh_obj.vertex_groups.get(vert_grp_name)
     if from_vert_grp is None:
         return
     delete_vertex_group(to_mesh_obj, vert_grp_name)
-    copy_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name)
+    copy_vertex_group_weighted(from_mesh_obj, to_mesh_obj, vert_grp_name, weight_matrix, weight_precision)
 
 def copy_name_only_vertex_group(to_mesh_obj, vert_grp_name):
     delete_vertex_group(to_mesh_obj, vert_grp_name)
     to_mesh_obj.vertex_groups.new(name=vert_grp_name)
 
-def copy_vgroups_by_name_prefix(obj_src, obj_dest, name_prefix, create_name_only):
+def copy_vgroups_by_name_prefix(obj_src, obj_dest, name_prefix, create_name_only, weight_precision=0.0):
+    # read all vertex group weights of source once, and re-use for all copied groups
+    weight_matrix = None
     for vgrp in obj_src.vertex_groups:
         if re.match(name_prefix + "\w*", vgrp.name):
             if create_name_only:
                 copy_name_only_vertex_group(obj_dest, vgrp.name)
             else:
-                copy_replace_vertex_group_weighted(obj_src, obj_dest, vgrp.name)
+                if weight_matrix is None:
+                    weight_matrix = get_vgroup_weight_matrix(obj_src)
+                copy_replace_vertex_group_weighted(obj_src, obj_dest, vgrp.name, weight_matrix, weight_precision)
 
 def delete_vertex_group(mesh_obj, vert_grp_name):
     vg = mesh_obj.vertex_groups.get(vert_grp_name)
@@ -92,3 +157,55 @@ def delete_vgroups_by_name_prefix(mesh_obj, name_prefix):
     for vgrp in mesh_obj.vertex_groups:
         if re.match(name_prefix + "\w*", vgrp.name):
             delete_vertex_group(mesh_obj, vgrp.name)
+
+# with all unlocked vertex groups matching 'name_prefix', apply (in order) for each vertex:
+#   - clean: remove vertex from groups where weight <= 'clean_epsilon', if 'clean' is True
+#   - limit total: keep only largest 'limit_total' weights, if 'limit_total' > 0
+#   - normalize: scale weights so that sum of weights is 1, if 'normalize' is True
+# all groups are read in one pass over vertexes, and written back in bulk. Returns number of groups changed
+def cleanup_vgroups_by_name_prefix(mesh_obj, name_prefix, normalize, limit_total, clean, clean_epsilon,
+                                   weight_precision=0.0):
+    vert_grps = [ vgrp for vgrp in mesh_obj.vertex_groups
+                  if re.match(name_prefix + "\w*", vgrp.name) and not vgrp.lock_weight ]
+    if len(vert_grps) == 0:
+        return 0
+    weight_matrix = get_vgroup_weight_matrix(mesh_obj)
+    grp_rows = [ get_weight_matrix_row(weight_matrix, vgrp.index) for vgrp in vert_grps ]
+    grp_starts = np_zeros(len(vert_grps) + 1, dtype=np_int32)
+    grp_starts[1:] = np_cumsum([ len(vert_indexes) for vert_indexes, _ in grp_rows ])
+    vert_indexes = np_concatenate([ vert_indexes for vert_indexes, _ in grp_rows ])
+    old_weights = np_concatenate([ weights for _, weights in grp_rows ])
+    weights = old_weights.copy()
+    keep = np_ones(len(weights), dtype=bool)
+    if clean:
+        keep &= weights > clean_epsilon
+    if limit_total > 0:
+        # sort kept weights by vertex, and by descending weight within each vertex, then keep first 'limit_total'
+        kept = keep.nonzero()[0]
+        kept = kept[np_lexsort((-weights[kept], vert_indexes[kept]))]
+        kept_verts = vert_indexes[kept]
+        is_run_start = np_concatenate(([True], kept_verts[1:] != kept_verts[:-1]))
+        # rank of each weight within its vertex, 0 is largest weight
+        ranks = np_arange(len(kept)) - np_repeat(is_run_start.nonzero()[0], np_bincount(np_cumsum(is_run_start) - 1))
+        keep[kept[ranks >= limit_total]] = False
+    if normalize:
+        vert_sums = np_bincount(vert_indexes[keep], weights=weights[keep], minlength=len(mesh_obj.data.vertices))
+        sums = vert_sums[vert_indexes]
+        norm_mask = keep & (sums > 0.0)
+        weights[norm_mask] = (weights[norm_mask] / sums[norm_mask]).clip(0.0, 1.0)
+    # write back only removed and changed weights
+    changed_count = 0
+    for i, vgrp in enumerate(vert_grps):
+        start = grp_starts[i]
+        end = grp_starts[i+1]
+        grp_keep = keep[start:end]
+        remove_verts = vert_indexes[start:end][~grp_keep]
+        change_mask = grp_keep & (weights[start:end] != old_weights[start:end])
+        if len(remove_verts) == 0 and not change_mask.any():
+            continue
+        if len(remove_verts) > 0:
+            vgrp.remove(remove_verts.tolist())
+        add_vertex_group_weights(vgrp, vert_indexes[start:end][change_mask], weights[start:end][change_mask],
+                                 weight_precision)
+        changed_count += 1
+    return changed_count
@@ -18,81 +18,107 @@
 
 import bpy
 
-SC_TEMP_VGRP_NAME = "TempVGroup"
+from numpy import arange as np_arange
+from numpy import concatenate as np_concatenate
+from numpy import float32 as np_float32
+from numpy import full as np_full
+from numpy import inf as np_inf
+from numpy import int32 as np_int32
+from numpy import logical_and as np_logical_and
+
+from .vgroup_func import (add_vertex_group_weights, get_vgroup_weight_matrix)
+from .weight_paint_func import (WP_GROW_PAINT_MODE_DISTANCE, WP_SELECT_COMBINE_AND, get_cached_geodesic_distances,
+    get_falloff_influence, get_mesh_vert_adjacency, get_mesh_vert_bools, get_vert_ring_indexes,
+    get_vert_weight_range_mask, parse_vert_group_ranges, set_mesh_vert_selection)
 
 # iterations must be >= 1
 def grow_paint(paint_object, paint_vg_index, iterations, start_weight, end_weight, paint_initial_selection,
     tail_fill, tail_fill_value, only_connected):
     old_3dview_mode = bpy.context.object.mode
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_mode(type='VERT')
-
-    # apply starting weight paint to only initial selection, if needed
+    # switch to object mode so that mesh selection and vertex group data is up to date
+    bpy.ops.object.mode_set(mode='OBJECT')
+    mesh = paint_object.data
+
+    # 'select more' iterations are breadth-first rings of vertexes, starting from selected vertexes at ring 0,
+    # hidden vertexes are never reached. If linked tail fill is needed then continue growth to all linked vertexes
+    hidden_mask = get_mesh_vert_bools(mesh, "hide")
+    max_rings = iterations
+    if tail_fill and only_connected:
+        max_rings = None
+    ring_indexes = get_vert_ring_indexes(get_mesh_vert_adjacency(mesh),
+                                         get_mesh_vert_bools(mesh, "select"), hidden_mask, max_rings)
+    grown_mask = np_logical_and(ring_indexes >= 0, ring_indexes <= iterations)
+
+    # if initial selection is painted with start_weight, then offset weight blend by +1:
+    # first iteration gets start_weight blended slightly to end_weight
     if paint_initial_selection:
-        # switch to group which needs weight paint
-        paint_object.vertex_groups.active_index = paint_vg_index
-        # paint the group with the "Start Weight"
-        bpy.context.scene.tool_settings.vertex_group_weight = start_weight
-        bpy.ops.object.vertex_group_assign()
-
-    # create a temp vertex group containing only current selection
-    temp_sel_vgrp = paint_object.vertex_groups.new(name=SC_TEMP_VGRP_NAME)
-    paint_object.vertex_groups.active_index = temp_sel_vgrp.index
-    bpy.context.scene.tool_settings.vertex_group_weight = 1.0
-    bpy.ops.object.vertex_group_assign()
-
-    for i in range(iterations):
-        # grow selection
-        bpy.ops.mesh.select_more()
-
-        # deselect the previous selection, so only the 'select more' vertexes remain selected
-        paint_object.vertex_groups.active_index = temp_sel_vgrp.index
-        bpy.ops.object.vertex_group_deselect()
-
-        # assign the blended weight paint to only the 'select more' vertexes
-        paint_object.vertex_groups.active_index = paint_vg_index
-
-        # if initial selection was painted with start_weight, then then offset weight blend by +1:
-        # first iteration gets start_weight blended slightly to end_weight
-        vw = start_weight
-        if paint_initial_selection:
-            vw = (end_weight - start_weight) * (i+1) / iterations + start_weight
-        # otherwise, offset weight blend by zero:
-        # first iteration gets start_weight
-        elif iterations > 1:
-            vw = (end_weight - start_weight) * i / (iterations-1) + start_weight
-
-        bpy.context.scene.tool_settings.vertex_group_weight = vw
-        bpy.ops.object.vertex_group_assign()
-
-        # add back deselected vertexes, to resume 'grown' selection
-        paint_object.vertex_groups.active_index = temp_sel_vgrp.index
-        bpy.ops.object.vertex_group_select()
-        # add re-selected 'select more' vertexes to the temp group
-        bpy.context.scene.tool_settings.vertex_group_weight = 1.0
-        bpy.ops.object.vertex_group_assign()
-
+        paint_mask = grown_mask
+        ring_weights = (end_weight - start_weight) * np_arange(iterations+1) / iterations + start_weight
+    # otherwise, offset weight blend by zero:
+    # first iteration gets start_weight
+    else:
+        paint_mask = np_logical_and(grown_mask, ring_indexes > 0)
+        ring_weights = np_full(iterations+1, start_weight)
+        if iterations > 1:
+            ring_weights[1:] = (end_weight - start_weight) * np_arange(iterations) / (iterations-1) + start_weight
+    paint_verts = paint_mask.nonzero()[0]
+    paint_weights = ring_weights[ring_indexes[paint_verts]]
+
+    # selection will be at the largest after growth
+    sel_mask = grown_mask
     # if tail fill enabled then set certain remaining vertexes (vertexes not selected yet) to
     # tail fill weight paint value
     if tail_fill:
         if only_connected:
-            # from previous code, selection will be at the largest, so keep a copy of selection, ...
-            paint_object.vertex_groups.active_index = temp_sel_vgrp.index
-            bpy.context.scene.tool_settings.vertex_group_weight = 1.0
-            bpy.ops.object.vertex_group_assign()
-            # select all connect verts, ...
-            bpy.ops.mesh.select_linked(delimit=set())
-            # and deselect the previous largest selection to assign paint to verts that are linked, and not yet painted
-            bpy.ops.object.vertex_group_deselect()
+            # vertexes that are linked, and not yet painted
+            sel_mask = ring_indexes > iterations
         else:
-            bpy.ops.mesh.select_all(action='INVERT')
+            sel_mask = np_logical_and(~grown_mask, ~hidden_mask)
+        tail_verts = sel_mask.nonzero()[0]
+        paint_verts = np_concatenate((paint_verts, tail_verts))
+        paint_weights = np_concatenate((paint_weights, np_full(len(tail_verts), tail_fill_value)))
+
+    # write all weights to vertex group in bulk, with one add() per ring
+    paint_object.vertex_groups.active_index = paint_vg_index
+    add_vertex_group_weights(paint_object.vertex_groups[paint_vg_index], paint_verts.astype(np_int32),
+                             paint_weights.astype(np_float32))
+    set_mesh_vert_selection(mesh, sel_mask)
 
-        paint_object.vertex_groups.active_index = paint_vg_index
-        bpy.context.scene.tool_settings.vertex_group_weight = tail_fill_value
-        bpy.ops.object.vertex_group_assign()
+    bpy.ops.object.mode_set(mode=old_3dview_mode)
+
+# max_distance must be > 0
+def grow_paint_distance(paint_object, paint_vg_index, max_distance, start_weight, end_weight, falloff_type,
+    paint_initial_selection, tail_fill, tail_fill_value, only_connected):
+    old_3dview_mode = bpy.context.object.mode
+    # switch to object mode so that mesh selection and vertex group data is up to date
+    bpy.ops.object.mode_set(mode='OBJECT')
+    mesh = paint_object.data
+
+    # geodesic distances are cached per selection, so changing weights / distance / falloff only re-maps weights
+    hidden_mask = get_mesh_vert_bools(mesh, "hide")
+    distances = get_cached_geodesic_distances(paint_object, get_mesh_vert_bools(mesh, "select"), hidden_mask)
+    grown_mask = distances <= max_distance
+    paint_mask = grown_mask
+    if not paint_initial_selection:
+        paint_mask = np_logical_and(grown_mask, distances > 0.0)
+    paint_verts = paint_mask.nonzero()[0]
+    paint_weights = end_weight + (start_weight - end_weight) * \
+        get_falloff_influence(distances[paint_verts] / max_distance, falloff_type)
 
+    if tail_fill:
+        if only_connected:
+            # linked vertexes have finite distance
+            tail_mask = np_logical_and(~grown_mask, distances < np_inf)
+        else:
+            tail_mask = np_logical_and(~grown_mask, ~hidden_mask)
+        tail_verts = tail_mask.nonzero()[0]
+        paint_verts = np_concatenate((paint_verts, tail_verts))
+        paint_weights = np_concatenate((paint_weights, np_full(len(tail_verts), tail_fill_value)))
+
+    # selection is not changed, so Grow Paint can be repeated with different settings and re-use cached distances
     paint_object.vertex_groups.active_index = paint_vg_index
-    paint_object.vertex_groups.remove(temp_sel_vgrp)
+    add_vertex_group_weights(paint_object.vertex_groups[paint_vg_index], paint_verts.astype(np_int32),
+                             paint_weights.astype(np_float32))
 
     bpy.ops.object.mode_set(mode=old_3dview_mode)
 
@@ -114,32 +140,39 @@ class AMH2B_OT_GrowPaint(bpy.types.Operator):
             self.report({'ERROR'}, "Active object does not have a vertex group")
             return {'CANCELLED'}
         a = context.scene.amh2b
-        grow_paint(ob_act, vg_ai, a.wp_grow_paint_iterations, a.wp_grow_paint_start_weight,
-            a.wp_grow_paint_end_weight, a.wp_paint_initial_selection, a.wp_tail_fill_enable,
-            a.wp_tail_fill_value, a.wp_tail_fill_connected)
+        if a.wp_grow_paint_mode == WP_GROW_PAINT_MODE_DISTANCE:
+            grow_paint_distance(ob_act, vg_ai, a.wp_grow_paint_distance, a.wp_grow_paint_start_weight,
+                a.wp_grow_paint_end_weight, a.wp_grow_paint_falloff, a.wp_paint_initial_selection,
+                a.wp_tail_fill_enable, a.wp_tail_fill_value, a.wp_tail_fill_connected)
+        else:
+            grow_paint(ob_act, vg_ai, a.wp_grow_paint_iterations, a.wp_grow_paint_start_weight,
+                a.wp_grow_paint_end_weight, a.wp_paint_initial_selection, a.wp_tail_fill_enable,
+                a.wp_tail_fill_value, a.wp_tail_fill_connected)
         return {'FINISHED'}
 
-def select_vertex_by_weight(obj, vert_group_index, min_weight, max_weight, deselect_first):
+# 'vert_group_ranges' is list of (vertex group index, min weight, max weight), combined with AND if 'combine_and' is
+# True, otherwise combined with OR
+def select_vertex_by_weight(obj, vert_group_ranges, combine_and, deselect_first, unassigned_zero=False):
     old_3dview_mode = bpy.context.object.mode
-    if deselect_first:
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_mode(type='VERT')
-        bpy.ops.mesh.select_all(action='DESELECT')
-    bpy.ops.object.mode_set(mode='OBJECT')
-    verts = [v for v in obj.data.vertices]
-    for v in verts:
-        actual_grp_list = [g for g in v.groups if g.group == vert_group_index]
-        if len(actual_grp_list) < 1:
-            continue
-        actual_grp = actual_grp_list[0]
-        vw = actual_grp.weight
-        if vw <= max_weight and vw >= min_weight:
-            v.select = True
-    bpy.ops.object.mode_set(mode=old_3dview_mode)
+    # switch to object mode, if needed, so that mesh selection is up to date
+    if old_3dview_mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    mesh = obj.data
+    # read weights of all groups in one pass over vertexes
+    sel_mask = get_vert_weight_range_mask(get_vgroup_weight_matrix(obj), len(mesh.vertices), vert_group_ranges,
+                                          combine_and, unassigned_zero)
+    # hidden vertexes are not selected
+    sel_mask &= ~get_mesh_vert_bools(mesh, "hide")
+    if not deselect_first:
+        sel_mask |= get_mesh_vert_bools(mesh, "select")
+    set_mesh_vert_selection(mesh, sel_mask)
+    if old_3dview_mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode=old_3dview_mode)
 
 class AMH2B_OT_SelectVertexByWeight(bpy.types.Operator):
     """With active object, deselect all vertices (optional), then select only vertices with weights between """ \
-        """min_weight and max_weight, inclusive"""
+        """min_weight and max_weight, inclusive. Other Groups weight ranges are combined with active group weight """ \
+        """range, using And / Or"""
     bl_idname = "amh2b.wp_select_vertex_by_weight"
     bl_label = "Select by Weight"
     bl_options = {'REGISTER', 'UNDO'}
@@ -154,5 +187,11 @@ class AMH2B_OT_SelectVertexByWeight(bpy.types.Operator):
             self.report({'ERROR'}, "Active object does not have a vertex group")
             return {'CANCELLED'}
         a = context.scene.amh2b
-        select_vertex_by_weight(ob_act, vg_ai, a.wp_select_vertex_min_w, a.wp_select_vertex_max_w, a.wp_select_vertex_deselect)
+        other_ranges, err_msg = parse_vert_group_ranges(ob_act, a.wp_select_vertex_other_groups)
+        if err_msg != None:
+            self.report({'ERROR'}, err_msg)
+            return {'CANCELLED'}
+        select_vertex_by_weight(ob_act, [ (vg_ai, a.wp_select_vertex_min_w, a.wp_select_vertex_max_w) ] + other_ranges,
+            a.wp_select_vertex_combine == WP_SELECT_COMBINE_AND, a.wp_select_vertex_deselect,
+            a.wp_select_vertex_unassigned_zero)
         return {'FINISHED'}
@@ -0,0 +1,265 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from heapq import (heappop, heappush)
+
+from numpy import arange as np_arange
+from numpy import array as np_array
+from numpy import argsort as np_argsort
+from numpy import bincount as np_bincount
+from numpy import concatenate as np_concatenate
+from numpy import cumsum as np_cumsum
+from numpy import empty as np_empty
+from numpy import float32 as np_float32
+from numpy import float64 as np_float64
+from numpy import full as np_full
+from numpy import inf as np_inf
+from numpy import int32 as np_int32
+from numpy import int64 as np_int64
+from numpy import logical_and as np_logical_and
+from numpy import repeat as np_repeat
+from numpy import sqrt as np_sqrt
+from numpy import unique as np_unique
+from numpy import zeros as np_zeros
+
+from .object_func import get_mesh_edge_verts, get_mesh_vert_cos
+from .vgroup_func import get_weight_matrix_row
+
+WP_GROW_PAINT_MODE_RINGS = "RINGS"
+WP_GROW_PAINT_MODE_DISTANCE = "DISTANCE"
+WP_GROW_PAINT_MODE_ITEMS = [
+    (WP_GROW_PAINT_MODE_RINGS, "Rings", "Blend weight by number of 'select more' iterations (rings of vertexes)"),
+    (WP_GROW_PAINT_MODE_DISTANCE, "Distance", "Blend weight by distance along mesh edges (geodesic distance) from " +
+     "selected vertexes, so result does not depend on mesh density"),
+    ]
+
+WP_FALLOFF_ITEMS = [
+    ("LINEAR", "Linear", "Linear falloff"),
+    ("SMOOTH", "Smooth", "Smooth falloff"),
+    ("SPHERE", "Sphere", "Spherical falloff"),
+    ("ROOT", "Root", "Root falloff"),
+    ("SHARP", "Sharp", "Sharp falloff"),
+    ]
+
+WP_SELECT_COMBINE_AND = "AND"
+WP_SELECT_COMBINE_OR = "OR"
+WP_SELECT_COMBINE_ITEMS = [
+    (WP_SELECT_COMBINE_AND, "And", "Select vertexes with weights in range for all groups"),
+    (WP_SELECT_COMBINE_OR, "Or", "Select vertexes with weights in range for any group"),
+    ]
+
+# geodesic distances of most recent Distance mode Grow Paint, by object name: (cache key, distances)
+geodesic_distance_cache = {}
+
+def get_mesh_vert_bools(mesh, attr_name):
+    vert_bools = np_zeros(len(mesh.vertices), dtype=bool)
+    mesh.vertices.foreach_get(attr_name, vert_bools)
+    return vert_bools
+
+# returns (loop_starts, loop_totals, loop_verts) of all mesh polygons
+def get_mesh_poly_loops(mesh):
+    poly_count = len(mesh.polygons)
+    loop_starts = np_empty(poly_count, dtype=np_int32)
+    loop_totals = np_empty(poly_count, dtype=np_int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_verts = np_empty(len(mesh.loops), dtype=np_int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return loop_starts, loop_totals, loop_verts
+
+# set selection state of vertexes from 'vert_mask', and flush to edges and faces (vertex select mode)
+def set_mesh_vert_selection(mesh, vert_mask):
+    mesh.vertices.foreach_set("select", vert_mask)
+    edge_verts = get_mesh_edge_verts(mesh)
+    mesh.edges.foreach_set("select", np_logical_and(vert_mask[edge_verts[:, 0]], vert_mask[edge_verts[:, 1]]))
+    if len(mesh.polygons) > 0:
+        loop_starts, _, loop_verts = get_mesh_poly_loops(mesh)
+        mesh.polygons.foreach_set("select", np_logical_and.reduceat(vert_mask[loop_verts], loop_starts))
+
+# returns (row_starts, neighbor_verts), a compressed sparse row (CSR) vertex adjacency graph built from mesh edges.
+# If 'use_face_step' is True then vertexes that share a face are also adjacent, to match Blender's 'Select More'
+def get_mesh_vert_adjacency(mesh, use_face_step=True):
+    vert_count = len(mesh.vertices)
+    edge_verts = get_mesh_edge_verts(mesh)
+    from_verts = [ edge_verts[:, 0], edge_verts[:, 1] ]
+    to_verts = [ edge_verts[:, 1], edge_verts[:, 0] ]
+    if use_face_step and len(mesh.polygons) > 0:
+        loop_starts, loop_totals, loop_verts = get_mesh_poly_loops(mesh)
+        # pair every vertex of each face with every other vertex of same face, grouped by face size
+        for face_size in np_unique(loop_totals).tolist():
+            face_loops = loop_starts[loop_totals == face_size][:, None] + np_arange(face_size)
+            face_verts = loop_verts[face_loops]
+            for offset in range(1, face_size):
+                from_verts.append(face_verts.reshape(-1))
+                to_verts.append(face_verts[:, list(range(offset, face_size)) + list(range(offset))].reshape(-1))
+    # remove duplicate pairs, sorted by 'from' vertex
+    pair_keys = np_concatenate(from_verts).astype(np_int64) * vert_count + np_concatenate(to_verts)
+    pair_keys.sort()
+    if len(pair_keys) > 1:
+        pair_keys = pair_keys[np_concatenate(([True], pair_keys[1:] != pair_keys[:-1]))]
+    row_starts = np_zeros(vert_count + 1, dtype=np_int32)
+    row_starts[1:] = np_cumsum(np_bincount(pair_keys // vert_count, minlength=vert_count))
+    return row_starts, (pair_keys % vert_count).astype(np_int32)
+
+# returns all neighbors of 'verts' (may contain duplicates), from CSR adjacency graph
+def get_adjacent_verts(adjacency, verts):
+    row_starts, neighbor_verts = adjacency
+    starts = row_starts[verts]
+    counts = row_starts[verts + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return neighbor_verts[:0]
+    # index of each neighbor, in 'neighbor_verts', for concatenated rows
+    offsets = np_repeat(starts - np_cumsum(counts) + counts, counts)
+    return neighbor_verts[offsets + np_arange(total)]
+
+# returns breadth-first ring index of each vertex, i.e. number of 'Select More' steps needed to reach vertex from
+# 'start_mask' vertexes (ring index 0). Vertexes not reached get ring index -1. Vertexes in 'blocked_mask' (e.g.
+# hidden) are never reached. If 'max_rings' is None then growth continues until all linked vertexes are reached
+def get_vert_ring_indexes(adjacency, start_mask, blocked_mask=None, max_rings=None):
+    ring_indexes = np_full(len(start_mask), -1, dtype=np_int32)
+    if blocked_mask is not None:
+        start_mask = np_logical_and(start_mask, ~blocked_mask)
+    ring_indexes[start_mask] = 0
+    visited = start_mask.copy()
+    if blocked_mask is not None:
+        visited |= blocked_mask
+    frontier = start_mask.nonzero()[0].astype(np_int32)
+    ring = 0
+    while len(frontier) > 0 and (max_rings is None or ring < max_rings):
+        ring += 1
+        frontier = get_adjacent_verts(adjacency, frontier)
+        frontier = np_unique(frontier[~visited[frontier]])
+        visited[frontier] = True
+        ring_indexes[frontier] = ring
+    return ring_indexes
+
+# returns (row_starts, neighbor_verts, edge_lengths), a compressed sparse row (CSR) vertex adjacency graph built from
+# mesh 'edge_verts' (see get_mesh_edge_verts()), with length of each edge computed from 'vert_cos'
+def get_edge_length_adjacency(vert_cos, edge_verts):
+    vert_count = len(vert_cos)
+    from_verts = np_concatenate((edge_verts[:, 0], edge_verts[:, 1]))
+    to_verts = np_concatenate((edge_verts[:, 1], edge_verts[:, 0]))
+    order = np_argsort(from_verts, kind='stable')
+    from_verts = from_verts[order]
+    to_verts = to_verts[order]
+    edge_vecs = vert_cos[to_verts] - vert_cos[from_verts]
+    row_starts = np_zeros(vert_count + 1, dtype=np_int32)
+    row_starts[1:] = np_cumsum(np_bincount(from_verts, minlength=vert_count))
+    return row_starts, to_verts, np_sqrt((edge_vecs * edge_vecs).sum(axis=1))
+
+# returns shortest distance along edges from nearest 'start_mask' vertex to each vertex (multi-source Dijkstra).
+# Vertexes not reached get distance inf, vertexes in 'blocked_mask' (e.g. hidden) are never reached
+def get_vert_geodesic_distances(length_adjacency, start_mask, blocked_mask=None):
+    row_starts, neighbor_verts, edge_lengths = length_adjacency
+    row_starts = row_starts.tolist()
+    neighbor_verts = neighbor_verts.tolist()
+    edge_lengths = edge_lengths.tolist()
+    distances = [ np_inf ] * len(start_mask)
+    if blocked_mask is None:
+        done = [ False ] * len(start_mask)
+    else:
+        start_mask = np_logical_and(start_mask, ~blocked_mask)
+        done = blocked_mask.tolist()
+    heap = []
+    for v in start_mask.nonzero()[0].tolist():
+        distances[v] = 0.0
+        heap.append((0.0, v))
+    while heap:
+        dist, v = heappop(heap)
+        if done[v]:
+            continue
+        done[v] = True
+        for i in range(row_starts[v], row_starts[v+1]):
+            n = neighbor_verts[i]
+            if done[n]:
+                continue
+            n_dist = dist + edge_lengths[i]
+            if n_dist < distances[n]:
+                distances[n] = n_dist
+                heappush(heap, (n_dist, n))
+    return np_array(distances, dtype=np_float64)
+
+# returns falloff 'influence' of each value in 'factors' (0 to 1), where influence is 1 at factor 0 and influence
+# is 0 at factor 1
+def get_falloff_influence(factors, falloff_type):
+    x = 1.0 - factors.clip(0.0, 1.0)
+    if falloff_type == "SMOOTH":
+        return x * x * (3.0 - 2.0 * x)
+    elif falloff_type == "SPHERE":
+        return np_sqrt(2.0 * x - x * x)
+    elif falloff_type == "ROOT":
+        return np_sqrt(x)
+    elif falloff_type == "SHARP":
+        return x * x
+    return x
+
+# returns geodesic distance of each vertex from selected vertexes, in world space units, re-using distances from
+# previous call if selection, hidden state, and geometry of 'obj' have not changed
+def get_cached_geodesic_distances(obj, start_mask, blocked_mask):
+    mesh = obj.data
+    vert_cos = get_mesh_vert_cos(mesh) @ np_array(obj.matrix_world.to_3x3(), dtype=np_float32).T
+    edge_verts = get_mesh_edge_verts(mesh)
+    cache_key = (len(start_mask), hash(start_mask.tobytes()), hash(blocked_mask.tobytes()),
+                 hash(vert_cos.tobytes()), hash(edge_verts.tobytes()))
+    cached = geodesic_distance_cache.get(obj.name)
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    distances = get_vert_geodesic_distances(get_edge_length_adjacency(vert_cos, edge_verts), start_mask, blocked_mask)
+    geodesic_distance_cache[obj.name] = (cache_key, distances)
+    return distances
+
+# parse weight range query text, e.g. "cloth_goal:0.2:0.8, mask:0:0", into list of
+# (vertex group index, min weight, max weight) of 'obj'. Returns (list, None) on success, or (None, error message)
+def parse_vert_group_ranges(obj, query_text):
+    vert_group_ranges = []
+    for query in query_text.split(","):
+        query = query.strip()
+        if query == "":
+            continue
+        parts = query.rsplit(":", 2)
+        if len(parts) != 3:
+            return None, "Unable to read weight range '%s', expected format is 'group name:min:max'" % query
+        vert_grp = obj.vertex_groups.get(parts[0].strip())
+        if vert_grp is None:
+            return None, "Vertex group '%s' not found in object '%s'" % (parts[0].strip(), obj.name)
+        try:
+            vert_group_ranges.append( (vert_grp.index, float(parts[1]), float(parts[2])) )
+        except ValueError:
+            return None, "Unable to read min / max weight of weight range '%s'" % query
+    return vert_group_ranges, None
+
+# returns mask of vertexes with weights in range for all (AND) / any (OR) of the
+# (vertex group index, min weight, max weight) in 'vert_group_ranges'. Vertexes not assigned to a vertex group are
+# never in range, unless 'unassigned_zero' is True - then unassigned vertexes have weight 0
+def get_vert_weight_range_mask(weight_matrix, vert_count, vert_group_ranges, combine_and, unassigned_zero):
+    result_mask = np_full(vert_count, combine_and, dtype=bool)
+    for vert_group_index, min_weight, max_weight in vert_group_ranges:
+        vert_indexes, weights = get_weight_matrix_row(weight_matrix, vert_group_index)
+        vert_weights = np_zeros(vert_count, dtype=np_float32)
+        vert_weights[vert_indexes] = weights
+        range_mask = np_logical_and(vert_weights >= min_weight, vert_weights <= max_weight)
+        if not unassigned_zero:
+            assigned_mask = np_zeros(vert_count, dtype=bool)
+            assigned_mask[vert_indexes] = True
+            range_mask &= assigned_mask
+        if combine_and:
+            result_mask &= range_mask
+        else:
+            result_mask |= range_mask
+    return result_mask